@@ -1,9 +1,8 @@
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from game.baba import make
-from game.baba.my_envs import * 
-from game.baba.registration import register
+from game.baba.registration import make
+from game.baba.grid import RESET_ACTION, GIVE_UP_ACTION
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import pandas as pd
@@ -46,23 +45,14 @@ idx_to_img_key = {-1: 'water', -2: 'lava', 0: 'unseen', 1: 'empty', 2: 'wall', 3
 
 def actions_to_grids(game_type, actions):
     """
-    Given list of actions and game_type, generate list of grids
+    Given list of actions and game_type, generate array of grids
     """
     env = make(f"env/{game_type}")
-    init_grid = env.grid.encode()
-    reset_grid = np.full(init_grid.shape, -1)
-    giveup_grid = np.full(init_grid.shape, -2) 
-    grids = []
-    grids.append(init_grid)
-    for action in actions:
-        if action==-1:
-            grids.append(reset_grid)
-            env = make(f"env/{game_type}")
-        elif action==-2:
-            grids.append(giveup_grid)
-        else:
-            _, _, _, _ = env.step(action)
-            grids.append(env.grid.encode())
+    actions = np.asarray(actions, dtype=np.int64)
+    grids = env.rollout(actions).obs.astype(np.int16)
+    # reset and give up frames are drawn as water and lava
+    grids[1:][actions == RESET_ACTION] = RESET_ACTION
+    grids[1:][actions == GIVE_UP_ACTION] = GIVE_UP_ACTION
     return grids
 
 def grids_to_frames(grids, sid, game_type, image_dir='../human_experiment/app/static/imgs/keke_img', cell_size=32):
@@ -234,11 +224,6 @@ def get_example_game_image(padding=10):
     
 
 if __name__=="__main__":
-    for env in [Tutorial1, Tutorial2, Tutorial3, Tutorial4, Tutorial5, Tutorial6, Tutorial7, Tutorial8, Tutorial9, Tutorial10,
-                Env1D0, Env2D0, Env3D0, Env4D0, Env5D0, Env6D0, Env7D0, Env8D0, Env9D0, Env10D0, Env11D0,Env12D0, Env13D0, Env14D0, Env15D0,
-                Env1D1, Env2D1, Env3D1, Env4D1, Env5D1, Env6D1, Env7D1, Env8D1, Env9D1, Env10D1, Env11D1, Env12D1, Env13D1, Env14D1, Env15D1]:
-        register('env/' +  env.__name__, env)
-        
     df = pd.read_csv('data/clean_data.csv')
     
     video_path = "figs/videos/"
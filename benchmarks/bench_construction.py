@@ -0,0 +1,69 @@
+"""
+Benchmark the cost of constructing world objects: make_obj, WorldObj.decode, building the level grids and applying
+replacement rules (BabaIsYouGrid.replace).
+
+Run from the root of the repo:
+    python -m benchmarks.bench_construction
+"""
+import argparse
+import timeit
+
+from game.baba import my_envs
+from game.baba.grid import BabaIsYouGrid
+from game.baba.world_object import make_obj, WorldObj, OBJECT_TO_IDX, Ruleset
+
+
+def bench_make_obj(number):
+    names = ["wall", "goop", "baba", "rock", "keke", "flag", "border"]
+    t = timeit.timeit(lambda: [make_obj(name) for name in names], number=number)
+    return t / (number * len(names))
+
+
+def bench_decode(number):
+    codes = [OBJECT_TO_IDX[name] for name in ["wall", "baba", "flag", "rock", "is_word", "you_word", "baba_word"]]
+    t = timeit.timeit(lambda: [WorldObj.decode(code) for code in codes], number=number)
+    return t / (number * len(codes))
+
+
+def bench_replace(size, number):
+    """
+    Fill a size x size grid with rocks and replace all of them with flags
+    """
+    ruleset = Ruleset({})
+
+    def setup_and_replace():
+        grid = BabaIsYouGrid(size, size)
+        grid._ruleset = ruleset
+        for i in range(size):
+            for j in range(size):
+                rock = make_obj("rock")
+                rock.set_ruleset(ruleset)
+                grid.set(i, j, rock)
+        grid.replace("rock", "flag")
+
+    t = timeit.timeit(setup_and_replace, number=number)
+    # each cell constructs two objects
+    return t / (number * 2 * size * size)
+
+
+def bench_levels(number):
+    names = [f"Env{i}D{d}" for i in range(1, 16) for d in range(2)]
+    envs = [getattr(my_envs, name)() for name in names]
+    t = timeit.timeit(lambda: [env.reset() for env in envs], number=number)
+    return t / (number * len(envs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark object construction")
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=30, help="Size of the grid for the replace benchmark")
+    args = parser.parse_args()
+
+    print(f"make_obj:         {bench_make_obj(args.number)*1e6:8.2f} us/object")
+    print(f"WorldObj.decode:  {bench_decode(args.number)*1e6:8.2f} us/object")
+    print(f"grid.replace:     {bench_replace(args.size, max(1, args.number // 100))*1e6:8.2f} us/object")
+    print(f"level reset:      {bench_levels(max(1, args.number // 100))*1e3:8.2f} ms/level")
+
+
+if __name__ == "__main__":
+    main()
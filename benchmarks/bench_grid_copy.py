@@ -0,0 +1,45 @@
+"""
+Benchmark BabaIsYouGrid.copy (structural clone) against copy.deepcopy on the Env1-Env15 levels.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_grid_copy
+"""
+import argparse
+import timeit
+from copy import deepcopy
+
+import numpy as np
+
+from game.baba import my_envs
+
+
+def level_names():
+    return [f"Env{i}D{d}" for i in range(1, 16) for d in range(2)]
+
+
+def bench_level(name, number):
+    env = getattr(my_envs, name)()
+    grid = env.grid
+    t_deepcopy = timeit.timeit(lambda: deepcopy(grid), number=number) / number
+    t_copy = timeit.timeit(grid.copy, number=number) / number
+    # the clone must be indistinguishable from a deep copy
+    assert np.array_equal(grid.copy().encode(), deepcopy(grid).encode())
+    return t_deepcopy, t_copy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark grid copies")
+    parser.add_argument("--number", type=int, default=200, help="Number of copies per level")
+    args = parser.parse_args()
+
+    print(f"{'level':<10}{'deepcopy (us)':>15}{'copy (us)':>12}{'speedup':>10}")
+    speedups = []
+    for name in level_names():
+        t_deepcopy, t_copy = bench_level(name, args.number)
+        speedups.append(t_deepcopy / t_copy)
+        print(f"{name:<10}{t_deepcopy*1e6:>15.1f}{t_copy*1e6:>12.1f}{speedups[-1]:>9.1f}x")
+    print(f"mean speedup: {np.mean(speedups):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
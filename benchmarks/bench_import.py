@@ -0,0 +1,67 @@
+"""
+Measure the import time of the simulation core and the agents with `python -X importtime`.
+
+Each module is imported in a fresh interpreter with bytecode caching on, and the best of several runs is
+kept. numpy is the only required dependency of the core, so its import time is reported separately and
+the target applies to the rest. The rendering, video and GUI dependencies (gym, matplotlib, cv2, pygame,
+pandas, PIL) must not be imported at all.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_import
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# target import time in ms, numpy excluded
+TARGETS = {
+    "game.baba.grid": 50,
+    "game.baba.registration": 15,
+    "models.flat_agent": 60,
+}
+HEAVY_MODULES = ["gym", "matplotlib", "cv2", "pygame", "pandas", "PIL"]
+
+
+def import_times(module):
+    """
+    Cumulative import time in us of every top-level package imported by `import module`
+    """
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, env=env,
+    ).stderr
+    times = {}
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            name = name.strip()
+            times[name] = max(times.get(name, 0), int(cumulative))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the core modules")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters per module")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<20}{'total ms':>10}{'numpy ms':>10}{'rest ms':>10}{'target ms':>11}")
+    for module, target in TARGETS.items():
+        runs = [import_times(module) for _ in range(args.runs)]
+        best = min(runs, key=lambda t: t[module])
+        total, numpy = best[module] / 1000, best.get("numpy", 0) / 1000
+        heavy = [m for m in HEAVY_MODULES if m in best]
+        ok = total - numpy <= target and not heavy
+        failed |= not ok
+        print(f"{module:<20}{total:>10.1f}{numpy:>10.1f}{total - numpy:>10.1f}{target:>11}  {'ok' if ok else 'FAIL'}")
+        if heavy:
+            print(f"    imports {', '.join(heavy)}")
+    sys.exit(int(failed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Measure the memory used by a grid state (as stored in the frontier of FlatAgent.BFS) for the Env1-Env15 levels.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_memory
+"""
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from game.baba import my_envs
+
+
+def grid_state_bytes(grid, n_copies):
+    """
+    Average number of bytes allocated for a copy of the grid
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    copies = [grid.copy() for _ in range(n_copies)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(copies) == n_copies
+    return (after - before) / n_copies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the memory used by grid states")
+    parser.add_argument("--copies", type=int, default=100, help="Number of copies to average over")
+    args = parser.parse_args()
+
+    print(f"{'level':<10}{'objects':>9}{'bytes/state':>13}{'bytes/object':>14}")
+    state_bytes = []
+    for name in [f"Env{i}D{d}" for i in range(1, 16) for d in range(2)]:
+        grid = getattr(my_envs, name)().grid
+        n_objects = sum(len(cell) - 1 for cell in grid.grid)
+        state_bytes.append(grid_state_bytes(grid, args.copies))
+        print(f"{name:<10}{n_objects:>9}{state_bytes[-1]:>13.0f}{state_bytes[-1]/n_objects:>14.1f}")
+    print(f"mean bytes per state: {np.mean(state_bytes):.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the number of environment steps per second of SubprocVecEnv for different numbers of workers with a python
+loop over the environments, on a batch mixing the Env1-Env15 levels.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_subproc_vec_env
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from game.baba import my_envs
+from game.baba.subproc_vec_env import SubprocVecEnv
+
+
+def level_fns(num_envs):
+    levels = [getattr(my_envs, f"Env{i}D{d}") for i in range(1, 16) for d in range(2)]
+    return [levels[k % len(levels)] for k in range(num_envs)]
+
+
+def bench_loop(env_fns, n_steps, seed=0):
+    envs = [env_fn() for env_fn in env_fns]
+    actions = np.random.default_rng(seed).integers(0, 5, (n_steps, len(envs)))
+    start = time.perf_counter()
+    for t in range(n_steps):
+        for env, action in zip(envs, actions[t]):
+            obs, reward, done, info = env.step(action)
+            if done:
+                env.reset()
+    return n_steps * len(envs) / (time.perf_counter() - start)
+
+
+def bench_subproc(env_fns, n_steps, num_workers, seed=0):
+    vec_env = SubprocVecEnv(env_fns, num_workers=num_workers)
+    vec_env.reset()
+    actions = np.random.default_rng(seed).integers(0, 5, (n_steps, len(env_fns)))
+    start = time.perf_counter()
+    for t in range(n_steps):
+        vec_env.step(actions[t])
+    steps_per_s = n_steps * len(env_fns) / (time.perf_counter() - start)
+    vec_env.close()
+    return steps_per_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the subprocess vectorized environment")
+    parser.add_argument("--steps", type=int, default=100, help="Number of steps")
+    parser.add_argument("--num-envs", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count()}))
+    args = parser.parse_args()
+
+    env_fns = level_fns(args.num_envs)
+    loop = bench_loop(env_fns, args.steps)
+    print(f"loop: {loop:.0f} steps/s")
+    print(f"{'workers':<10}{'steps/s':>10}{'speedup':>10}")
+    for num_workers in args.workers:
+        steps = bench_subproc(env_fns, args.steps, num_workers)
+        print(f"{num_workers:<10}{steps:>10.0f}{steps / loop:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measure the hit rate and the speedup of the transition cache of BabaIsYouEnv for different cache sizes, on random
+trials with reset loops (replayed with env.rollout).
+
+Run from the root of the repo:
+    python -m benchmarks.bench_transition_cache
+"""
+import argparse
+import time
+
+import numpy as np
+
+from game.baba import my_envs
+from game.baba.grid import TransitionCache, RESET_ACTION
+
+
+def random_trials(n_trials, n_steps, reset_prob, seed=0):
+    rng = np.random.default_rng(seed)
+    trials = rng.integers(1, 5, (n_trials, n_steps))
+    trials[rng.random((n_trials, n_steps)) < reset_prob] = RESET_ACTION
+    return trials
+
+
+def bench(env_cls, trials, cache):
+    start = time.perf_counter()
+    for actions in trials:
+        env_cls(transition_cache=cache).rollout(actions)
+    return trials.size / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the transition cache")
+    parser.add_argument("--env", default="Env1D0", help="Name of the level in my_envs")
+    parser.add_argument("--trials", type=int, default=20, help="Number of trials replayed")
+    parser.add_argument("--steps", type=int, default=200, help="Number of actions per trial")
+    parser.add_argument("--reset-prob", type=float, default=0.03, help="Probability of a reset action")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    env_cls = getattr(my_envs, args.env)
+    trials = random_trials(args.trials, args.steps, args.reset_prob)
+    baseline = bench(env_cls, trials, None)
+    print(f"no cache: {baseline:.0f} steps/s")
+    print(f"{'maxsize':<10}{'hits':>8}{'misses':>8}{'hit rate':>10}{'steps/s':>10}{'speedup':>10}")
+    for size in args.sizes:
+        cache = TransitionCache(size)
+        steps = bench(env_cls, trials, cache)
+        info = cache.info()
+        hit_rate = info.hits / max(info.hits + info.misses, 1)
+        print(f"{size:<10}{info.hits:>8}{info.misses:>8}{hit_rate:>10.2f}{steps:>10.0f}{steps / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compare the number of environment steps per second of BabaIsYouVecEnv with a python loop over the environments.
+
+Run from the root of the repo:
+    python -m benchmarks.bench_vec_env
+"""
+import argparse
+import time
+
+import numpy as np
+
+from game.baba import my_envs
+from game.baba.vec_env import BabaIsYouVecEnv
+
+
+def bench_loop(env_cls, num_envs, n_steps, seed=0):
+    envs = [env_cls() for _ in range(num_envs)]
+    actions = np.random.default_rng(seed).integers(0, 5, (n_steps, num_envs))
+    start = time.perf_counter()
+    for t in range(n_steps):
+        for env, action in zip(envs, actions[t]):
+            obs, reward, done, info = env.step(action)
+            if done:
+                env.reset()
+    return n_steps * num_envs / (time.perf_counter() - start)
+
+
+def bench_vec(env_cls, num_envs, n_steps, seed=0):
+    vec_env = BabaIsYouVecEnv(env_cls(), num_envs)
+    vec_env.reset()
+    actions = np.random.default_rng(seed).integers(0, 5, (n_steps, num_envs))
+    start = time.perf_counter()
+    for t in range(n_steps):
+        vec_env.step(actions[t])
+    return n_steps * num_envs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized environment")
+    parser.add_argument("--env", default="Env1D0", help="Name of the level in my_envs")
+    parser.add_argument("--steps", type=int, default=100, help="Number of steps")
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[1, 16, 64, 256])
+    args = parser.parse_args()
+
+    env_cls = getattr(my_envs, args.env)
+    print(f"{'num_envs':<10}{'loop steps/s':>15}{'vec steps/s':>15}{'speedup':>10}")
+    for num_envs in args.num_envs:
+        loop = bench_loop(env_cls, num_envs, args.steps)
+        vec = bench_vec(env_cls, num_envs, args.steps)
+        print(f"{num_envs:<10}{loop:>15.0f}{vec:>15.0f}{vec / loop:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
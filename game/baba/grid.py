@@ -1,14 +1,12 @@
 from __future__ import annotations
 
-import hashlib
 import math
 from abc import abstractmethod
+import pickle
+from collections import namedtuple, OrderedDict
 from enum import IntEnum
-from time import perf_counter
 
-import gym
 import numpy as np
-from gym import spaces
 
 # Size in pixels of a tile in the full-scale human view
 from . import world_object
@@ -25,8 +23,51 @@ from .rule import extract_ruleset
 
 TILE_PIXELS = 32
 
+# Initial number of stacked objects per cell stored in the grid planes (grown if needed)
+GRID_DEPTH = 4
+
 IDX_TO_OBJECT = dict(zip(OBJECT_TO_IDX.values(), OBJECT_TO_IDX.keys()))
 
+# Assumptions that can be added to a grid (see BabaIsYouGrid.encode)
+ASSUMPTIONS = [('baba', 'you'), ('wall', 'stop'), ('goop', 'sink'), ('flag', 'win')]
+# bit set in the encoding of the grid for each assumption
+ASSUMPTION_BITS = {e: 1 << i for i, e in enumerate(ASSUMPTIONS)}
+
+# Zobrist hashing: random 64-bit keys, generated by blocks from a fixed seed so that hashes are the same across processes
+ZOBRIST_SEED = 0
+ZOBRIST_BLOCK = 4096
+# number of object type codes
+N_CODES = max(IDX_TO_OBJECT) + 1
+_zobrist_keys = {}
+MASK64 = 2**64 - 1
+
+
+def zobrist_keys(stream, n):
+    """
+    Return the list of keys for the given stream, extended to at least n keys
+    """
+    keys = _zobrist_keys.setdefault(stream, [])
+    while len(keys) < n:
+        rng = np.random.default_rng([ZOBRIST_SEED, stream, len(keys) // ZOBRIST_BLOCK])
+        keys.extend(rng.integers(0, 2**64, size=ZOBRIST_BLOCK, dtype=np.uint64, endpoint=False).tolist())
+    return keys
+
+
+def mixed_key(n):
+    """
+    Key number n of the objects in the grid (splitmix64), computed instead of stored since there is one key per cell,
+    layer and type code
+    """
+    x = (n + 1) * 0x9e3779b97f4a7c15 + ZOBRIST_SEED & MASK64
+    x = (x ^ (x >> 30)) * 0xbf58476d1ce4e5b9 & MASK64
+    x = (x ^ (x >> 27)) * 0x94d049bb133111eb & MASK64
+    return x ^ (x >> 31)
+
+
+# keys of the agent position (stream 1, indexed by cell) and direction
+AGENT_DIR_KEYS = zobrist_keys(2, 4)[:4]
+ASSUMPTION_KEYS = dict(zip(ASSUMPTIONS, zobrist_keys(3, len(ASSUMPTIONS))))
+
 # Map of agent direction indices to vectors
 DIR_TO_VEC = [
     # Pointing right (positive X)
@@ -38,10 +79,42 @@ DIR_TO_VEC = [
     # Up (negative Y)
     np.array((0, -1)),
 ]
+# same vectors as tuples of ints, and the direction of each vector
+DIR_TO_TUPLE = [tuple(int(x) for x in v) for v in DIR_TO_VEC]
+VEC_TO_DIR = {v: d for d, v in enumerate(DIR_TO_TUPLE)}
+
+# Snapshot of the state of an env (see BabaIsYouEnv.get_state), the grid planes and the ruleset are stored as bytes
+EnvState = namedtuple("EnvState", [
+    "shape", "types", "dirs", "ids", "heights", "assumptions", "ruleset",
+    "agent_pos", "agent_dir", "step_count", "is_win", "is_lose"
+])
+
+# Trajectory replayed by BabaIsYouEnv.rollout: obs (T+1, W, H, encoding_level), agent_pos (T+1, 2), reward and done (T,)
+Rollout = namedtuple("Rollout", ["obs", "reward", "done", "agent_pos"])
+
+# Codes used in the recorded human data for resetting the level and giving up
+RESET_ACTION = -1
+GIVE_UP_ACTION = -2
+
 
 class BabaIsYouGrid:
     """
     Represent a grid and operations on it
+
+    Each cell holds a stack of objects (self.grid, with a None sentinel at the bottom). The same stacks are mirrored
+    in fixed-depth numpy planes indexed by [i, j, z], z counting up from the bottom object:
+        types: object type code (OBJECT_TO_IDX), 0 above the top of the stack
+        dirs: direction the object is facing
+        ids: rule block id, -1 if none
+        heights: number of objects in the cell
+    All changes to the cells must go through set/set_under/pop (and set_dir/set_id for objects already in the grid)
+    so that the planes stay in sync with the objects.
+
+    The grid also indexes the positions of the objects of each type and of the rule blocks by id (see positions and
+    block_pos), so that looking for some objects doesn't require going through all the cells.
+
+    The observation returned by encode is also cached and updated cell by cell. encode hands out read-only views of
+    it, the cache being copied on the next change if a view is still around (copy on write).
     """
 
     # Static cache of pre-renderer tiles
@@ -56,9 +129,33 @@ class BabaIsYouGrid:
 
         self.grid = [[None] for _ in range(width * height)]
         self.debug = debug
-        
+
+        self.types = np.zeros((width, height, GRID_DEPTH), dtype=np.uint8)
+        self.dirs = np.zeros((width, height, GRID_DEPTH), dtype=np.uint8)
+        self.ids = np.full((width, height, GRID_DEPTH), -1, dtype=np.int16)
+        self.heights = np.zeros((width, height), dtype=np.uint8)
+        # Zobrist hash of the object stacks, updated with the planes
+        self._hash = 0
+
+        # positions of the objects of each type, with the number of such objects in the cell
+        self._positions = {}
+        # position of the rule blocks by id
+        self._block_pos = {}
+
+        # Number of objects to encode for each cell
+        self._encoding_level = 2
+        self._obs = self._encode_planes()
+        self._obs_shared = False
+
         self.assumptions = []
 
+        # changes made to the grid are appended to the journal when it isn't None (see revert)
+        self._journal = None
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_journal', None)
+
     def __eq__(self, other):
         grid1 = self.encode()
         grid2 = other.encode()
@@ -68,24 +165,200 @@ class BabaIsYouGrid:
         return not self == other
 
     def copy(self):
-        from copy import deepcopy
-
-        return deepcopy(self)
+        """
+        Clone the grid, copying only the mutable per-cell state: the planes, the cell stacks and a shallow copy of each
+        object. Immutable data (rendered glyphs, types, ruleset tables) is shared with the original grid.
+        """
+        grid = self.__class__.__new__(self.__class__)
+        grid.__dict__.update(self.__dict__)
+        grid.types = self.types.copy()
+        grid.dirs = self.dirs.copy()
+        grid.ids = self.ids.copy()
+        grid.heights = self.heights.copy()
+        grid.assumptions = list(self.assumptions)
+        grid._journal = None
+        grid._positions = {t: dict(cells) for t, cells in self._positions.items()}
+        grid._block_pos = dict(self._block_pos)
+        # share the cached observation until one of the grids changes
+        self._obs_shared = grid._obs_shared = True
+
+        # objects sharing a ruleset keep sharing a (new) ruleset in the copy, like with deepcopy
+        rulesets = {}
+        def copy_ruleset(ruleset):
+            if not isinstance(ruleset, Ruleset):
+                return ruleset
+            if id(ruleset) not in rulesets:
+                rulesets[id(ruleset)] = ruleset.copy()
+            return rulesets[id(ruleset)]
+
+        if '_ruleset' in self.__dict__:
+            grid._ruleset = copy_ruleset(self._ruleset)
+
+        cells = []
+        for cell in self.grid:
+            new_cell = [None]
+            for e in cell[1:]:
+                e = e.clone()
+                ruleset = getattr(e, '_ruleset', None)
+                if ruleset is not None:
+                    e._ruleset = copy_ruleset(ruleset)
+                new_cell.append(e)
+            cells.append(new_cell)
+        grid.grid = cells
+        return grid
 
     def _get_idx(self, i, j):
         assert 0 <= i < self.width
         assert 0 <= j < self.height
         return j * self.width + i
 
+    def _grow(self):
+        """
+        Double the depth of the planes when a stack doesn't fit anymore
+        """
+        depth = self.types.shape[2]
+        self.types = np.concatenate([self.types, np.zeros_like(self.types)], axis=2)
+        self.dirs = np.concatenate([self.dirs, np.zeros_like(self.dirs)], axis=2)
+        self.ids = np.concatenate([self.ids, np.full_like(self.ids, -1)], axis=2)
+        assert self.types.shape[2] == 2 * depth
+
+    def _key(self, i, j, z, code):
+        return mixed_key(((z * self.height + j) * self.width + i) * N_CODES + code)
+
+    def _push(self, i, j, v):
+        """
+        Put v on top of the stack at i, j
+        """
+        self._insert(i, j, int(self.heights[i, j]), v)
+
+    def _insert(self, i, j, z, v):
+        """
+        Insert v at layer z (0 is the bottom object) of the stack at i, j, shifting up the objects above it
+        """
+        h = int(self.heights[i, j])
+        if h == self.types.shape[2]:
+            self._grow()
+        codes = self.types[i, j, z:h].tolist()
+        for k, code in enumerate(codes):
+            self._hash ^= self._key(i, j, z + k, code) ^ self._key(i, j, z + k + 1, code)
+        for plane in (self.types, self.dirs, self.ids):
+            plane[i, j, z+1:h+1] = plane[i, j, z:h]
+        code = v.encode()
+        self.types[i, j, z] = code
+        self._hash ^= self._key(i, j, z, code)
+        self.dirs[i, j, z] = getattr(v, 'dir', 0)
+        obj_id = getattr(v, 'id', None)
+        self.ids[i, j, z] = -1 if obj_id is None else obj_id
+        self.heights[i, j] = h + 1
+        self.grid[j * self.width + i].insert(z + 1, v)
+        self._update_obs(i, j)
+
+        pos = (int(i), int(j))
+        cells = self._positions.setdefault(v.type, {})
+        cells[pos] = cells.get(pos, 0) + 1
+        if obj_id is not None:
+            self._block_pos[obj_id] = pos
+        if self._journal is not None:
+            self._journal.append(('insert', i, j, z, v, v.cur_pos))
+
+    def _remove(self, i, j, z, v):
+        """
+        Remove the object v at layer z (0 is the bottom object) from the planes and the index, shifting down the objects
+        above it
+        """
+        pos = (int(i), int(j))
+        cells = self._positions[v.type]
+        if cells[pos] == 1:
+            del cells[pos]
+        else:
+            cells[pos] -= 1
+        obj_id = getattr(v, 'id', None)
+        if obj_id is not None and self._block_pos.get(obj_id) == pos:
+            del self._block_pos[obj_id]
+
+        h = int(self.heights[i, j])
+        codes = self.types[i, j, z:h].tolist()
+        for k, code in enumerate(codes):
+            self._hash ^= self._key(i, j, z + k, code)
+        for k, code in enumerate(codes[1:]):
+            self._hash ^= self._key(i, j, z + k, code)
+        for plane in (self.types, self.dirs, self.ids):
+            plane[i, j, z:h-1] = plane[i, j, z+1:h]
+        self.types[i, j, h-1] = 0
+        self.dirs[i, j, h-1] = 0
+        self.ids[i, j, h-1] = -1
+        self.heights[i, j] = h - 1
+        self._update_obs(i, j)
+        if self._journal is not None:
+            self._journal.append(('remove', i, j, z, v))
+
+    def _update_obs(self, i, j):
+        """
+        Update the cached observation of the cell i, j
+        """
+        if self._obs_shared:
+            self._obs = self._obs.copy()
+            self._obs_shared = False
+        h = int(self.heights[i, j])
+        for z in range(self._encoding_level):
+            self._obs[i, j, z] = self.types[i, j, h-1-z] if z < h else OBJECT_TO_IDX["empty"]
+
+    def _find_layer(self, v):
+        """
+        Return the position and layer of v in the grid, None if v is not in the grid
+        """
+        if v.cur_pos is None:
+            return None
+        i, j = v.cur_pos
+        if not (0 <= i < self.width and 0 <= j < self.height):
+            return None
+        cell = self.grid[j * self.width + i]
+        for z in range(1, len(cell)):
+            if cell[z] is v:
+                return i, j, z - 1
+        return None
+
+    def set_dir(self, v, dir):
+        """
+        Change the direction of the object v
+        """
+        if self._journal is not None:
+            self._journal.append(('dir', v, v.dir))
+        v.dir = dir = int(dir)
+        loc = self._find_layer(v)
+        if loc is not None:
+            self.dirs[loc] = dir
+
+    def set_id(self, v, id):
+        """
+        Change the id of the rule block v
+        """
+        old_id = v.id
+        if self._journal is not None:
+            self._journal.append(('id', v, old_id))
+        v.id = id
+        loc = self._find_layer(v)
+        if loc is not None:
+            self.ids[loc] = -1 if id is None else id
+            pos = (int(loc[0]), int(loc[1]))
+            if old_id is not None and self._block_pos.get(old_id) == pos:
+                del self._block_pos[old_id]
+            if id is not None:
+                self._block_pos[id] = pos
+
     def pop(self, i, j, z=None):
         """
         Remove the zth element in the list of objects at position i, j
         """
         idx = self._get_idx(i, j)
+        n = len(self.grid[idx])
         if z is None:
-            self.grid[idx].pop()
-        else:
-            self.grid[idx].pop(z)
+            z = n - 1
+        elif z < 0:
+            z = n + z
+        if z > 0:
+            self._remove(i, j, z - 1, self.grid[idx][z])
+        self.grid[idx].pop(z)
 
     def set(self, i, j, v):
         idx = self._get_idx(i, j)
@@ -95,6 +368,7 @@ class BabaIsYouGrid:
             if self.grid[idx] == [None]:
                 self.grid[idx] = [None]
             else:
+                self._remove(i, j, int(self.heights[i, j]) - 1, self.grid[idx][-1])
                 self.grid[idx] = self.grid[idx][0:-1]
         else:
             # if it's water, get rid of this object
@@ -103,8 +377,8 @@ class BabaIsYouGrid:
                 pass
             else:
                 # stack objects
-                self.grid[idx].append(v)
-                v.cur_pos = [i,j]
+                self._push(i, j, v)
+                v.cur_pos = (int(i), int(j))
        
     # now we assume we can only have two things stacked, which is not true
     def set_under(self, i, j, v):
@@ -116,6 +390,8 @@ class BabaIsYouGrid:
                 self.grid[idx] = [None]
             else:
                 # we want the thing at the top it!
+                for v in self.grid[idx][1:-1]:
+                    self._remove(i, j, 0, v)
                 self.grid[idx] = [None, self.grid[idx][-1]]
         else:
             # if it's water, get rid of this object
@@ -124,8 +400,8 @@ class BabaIsYouGrid:
                 pass
             else:
                 # stack objects
-                self.grid[idx].append(v)
-                v.cur_pos = [i,j]
+                self._push(i, j, v)
+                v.cur_pos = (int(i), int(j))
                 
             
     def get(self, i, j, z=-1):
@@ -155,22 +431,109 @@ class BabaIsYouGrid:
             return self.grid[j * self.width + i][-2]
 
     def replace(self, obj_type1: str, obj_type2: str):
-        for j in range(0, self.height):
-            for i in range(0, self.width):
-                cell = self.get(i, j)
-                if cell is None:
-                    continue
+        for (i, j) in self.positions(obj_type1, top=True):
+            new_obj = make_obj(obj_type2)
+            new_obj.set_ruleset(self._ruleset)
+            self.set(i, j, None)
+            self.set(i, j, new_obj)
 
-                if cell.type == obj_type1:
-                    new_obj = make_obj(obj_type2)
-                    new_obj.set_ruleset(self._ruleset)
-                    self.set(i, j, None)
-                    self.set(i, j, new_obj)
+    def positions(self, obj_types, top=False):
+        """
+        Return the positions of the objects of the given type(s), in the order of the cells in the grid
+        Args:
+            obj_types: type or list of types
+            top: only return the positions where such an object is at the top of the cell
+        """
+        if isinstance(obj_types, str):
+            obj_types = [obj_types]
+        pos_set = set()
+        for obj_type in obj_types:
+            pos_set.update(self._positions.get(obj_type, ()))
+        pos_list = sorted(pos_set, key=lambda pos: (pos[1], pos[0]))
+        if top:
+            pos_list = [(i, j) for (i, j) in pos_list if self.grid[j * self.width + i][-1].type in obj_types]
+        return pos_list
+
+    def object_types(self, top=False):
+        """
+        Return the set of types of the objects in the grid (only the objects at the top of a cell if top)
+        """
+        if not top:
+            return {obj_type for obj_type, cells in self._positions.items() if len(cells) > 0}
+        return {obj_type for obj_type in self._positions if len(self.positions(obj_type, top=True)) > 0}
+
+    def block_pos(self, block_id):
+        """
+        Return the position of the rule block with the given id, None if it isn't in the grid
+        """
+        return self._block_pos.get(block_id)
+
+    def hash(self):
+        """
+        64-bit Zobrist hash of the object stacks and the assumptions, maintained incrementally when the grid changes
+        """
+        h = self._hash
+        for e in self.assumptions:
+            h ^= ASSUMPTION_KEYS[e]
+        return h
 
     def __iter__(self):
         for elem in self.grid.__iter__():
             yield elem[-1]
 
+    def revert(self, journal):
+        """
+        Undo the changes recorded in a journal, in reverse order
+        """
+        recording, self._journal = self._journal, None
+        for change in reversed(journal):
+            if change[0] == 'insert':
+                _, i, j, z, v, cur_pos = change
+                self._remove(i, j, z, v)
+                self.grid[j * self.width + i].pop(z + 1)
+                v.cur_pos = cur_pos
+            elif change[0] == 'remove':
+                _, i, j, z, v = change
+                self._insert(i, j, z, v)
+            elif change[0] == 'dir':
+                self.set_dir(change[1], change[2])
+            elif change[0] == 'id':
+                self.set_id(change[1], change[2])
+        self._journal = recording
+
+    def load_planes(self, types, dirs, ids, heights, ruleset=None):
+        """
+        Set the object stacks to the ones described by the planes, only rebuilding the cells that differ
+        Args:
+            types, dirs, ids, heights: planes with the same width and height as the grid, any depth
+            ruleset: ruleset given to the new objects
+        """
+        while self.types.shape[2] < types.shape[2]:
+            self._grow()
+        depth = self.types.shape[2]
+        if types.shape[2] < depth:
+            pad = ((0, 0), (0, 0), (0, depth - types.shape[2]))
+            types, dirs = np.pad(types, pad), np.pad(dirs, pad)
+            ids = np.pad(ids, pad, constant_values=-1)
+
+        diff = (self.types != types) | (self.dirs != dirs) | (self.ids != ids)
+        diff = diff.any(axis=2) | (self.heights != heights)
+        for i, j in zip(*np.nonzero(diff)):
+            i, j = int(i), int(j)
+            cell = self.grid[j * self.width + i]
+            while len(cell) > 1:
+                self._remove(i, j, len(cell) - 2, cell[-1])
+                cell.pop()
+            for z in range(int(heights[i, j])):
+                v = WorldObj.decode(int(types[i, j, z]))
+                v.dir = int(dirs[i, j, z])
+                if ids[i, j, z] >= 0:
+                    v.id = int(ids[i, j, z])
+                if ruleset is not None and hasattr(v, "set_ruleset"):
+                    v.set_ruleset(ruleset)
+                v.cur_pos = (i, j)
+                self._push(i, j, v)
+
     @classmethod
     def render_tile(
             cls, obj, agent_dir=None, highlight=False, tile_size=TILE_PIXELS, subdivs=3
@@ -246,37 +609,52 @@ class BabaIsYouGrid:
 
         return img
 
-    def encode(self, vis_mask=None):
-        """
-        Produce a compact numpy encoding of the grid
-        """
+    @property
+    def encoding_level(self):
+        return self._encoding_level
 
-        if vis_mask is None:
-            vis_mask = np.ones((self.width, self.height), dtype=bool)
+    @encoding_level.setter
+    def encoding_level(self, encoding_level):
+        if encoding_level != self._encoding_level:
+            self._encoding_level = encoding_level
+            self._obs = self._encode_planes()
+            self._obs_shared = False
 
+    def _encode_planes(self):
+        """
+        Compute the encoding of all the cells from the planes
+        """
         array = np.zeros((self.width, self.height, 1 * self.encoding_level), dtype="uint8")
+        for idx, z in enumerate(range(1, self.encoding_level+1)): # 0, 1
+            # layer holding the zth object from the top, negative if the stack isn't that high
+            layer = self.heights.astype(np.intp) - z
+            codes = np.take_along_axis(self.types, np.maximum(layer, 0)[..., None], axis=2)[..., 0]
+            array[..., idx] = np.where(layer >= 0, codes, OBJECT_TO_IDX["empty"])
+        return array
 
-        tic = perf_counter()
-        for i in range(self.width):
-            for j in range(self.height):
-
-                if not vis_mask[i, j]:
-                    continue
-
-                for idx, z in enumerate(range(1, self.encoding_level+1)): # 0, 1
-                    v = self.get(i, j, -z)
-                    array[i, j, idx * 1:(idx + 1) * 1] = self.encode_cell(v)
-        
-        element_to_bit = {e: i for i, e in enumerate([('baba', 'you'), ('wall', 'stop'), ('goop', 'sink'), ('flag', 'win')])}
-        def subset_id(lst):
-            id = 0
-            for e in lst:
-                id |= 1 << element_to_bit[e]
-            return id
-        if len(self.assumptions)>0:
-            array[0,0,0] += subset_id(self.assumptions)
-            
-        print("Encoding grid", (perf_counter()-tic)*1000) if self.debug else None
+    def encode(self, vis_mask=None, out=None):
+        """
+        Produce a compact numpy encoding of the grid (read-only), or write it into out
+        """
+        if vis_mask is None and len(self.assumptions) == 0:
+            if out is not None:
+                out[...] = self._obs
+                return out
+            array = self._obs.view()
+            self._obs_shared = True
+        else:
+            array = self._obs.copy()
+            if vis_mask is not None:
+                array[~vis_mask] = 0
+            if len(self.assumptions) > 0:
+                subset_id = 0
+                for e in self.assumptions:
+                    subset_id |= ASSUMPTION_BITS[e]
+                array[0, 0, 0] += subset_id
+            if out is not None:
+                out[...] = array
+                return out
+        array.flags.writeable = False
         return array
 
     def encode_cell(self, v):
@@ -345,7 +723,55 @@ class BabaIsYouGrid:
         return mask
 
 
-class BabaIsYouEnv(gym.Env):
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# initial grid of each level by (env class, BabaIsYouEnv.level_key, encoding level), built once and copied by reset.
+# The grids of the templates are never modified, the least recently used ones are dropped above MAX_LEVEL_TEMPLATES
+MAX_LEVEL_TEMPLATES = 256
+LEVEL_TEMPLATES = OrderedDict()
+
+
+class TransitionCache:
+    """
+    Bounded LRU cache of the transitions of an env: (state hash, directions, ids, is_win, is_lose, action) -> snapshot of
+    the next state.
+    Can be shared by several envs of the same level.
+    """
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        state = self._entries.get(key)
+        if state is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return state
+
+    def put(self, key, state):
+        self._entries[key] = state
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+class BabaIsYouEnv:
+    """
+    Environment following the gym interface. It doesn't depend on gym (only imported to create the action and
+    observation spaces), see gym_env.GymEnv to use it with gym tools.
+    """
     metadata = {
         # Deprecated: use 'render_modes' instead
         "render.modes": ["human", "rgb_array", "dict"],
@@ -354,6 +780,8 @@ class BabaIsYouEnv(gym.Env):
         "render_fps": 10,
     }
 
+    spec = None
+
     # Enumeration of possible actions
     class Actions(IntEnum):
         idle = 0
@@ -382,15 +810,10 @@ class BabaIsYouEnv(gym.Env):
         # Action enumeration for this environment
         self.actions = BabaIsYouEnv.Actions
 
-        # Actions are discrete integer values
-        self.action_space = spaces.Discrete(len(self.actions))
-
-        self.observation_space = spaces.Box(
-            low=0,
-            high=255,
-            shape=(width, height, 1 * self.encoding_level),
-            dtype="uint8",
-        )
+        # Gym spaces, created when first used
+        self._action_space = None
+        self._observation_space = None
+        self._np_random = None
 
         # Range of possible rewards
         self.reward_range = (0, 1)
@@ -412,38 +835,94 @@ class BabaIsYouEnv(gym.Env):
         self._ruleset = {}
         self.default_ruleset = kwargs.get('default_ruleset', {})
 
+        # record the changes made by each step so that they can be undone (see undo)
+        self.record_undo = kwargs.get('undo', False)
+        self._undo_stack = []
+
+        # cache of the transitions (maximum number of entries or a TransitionCache shared with other envs)
+        transition_cache = kwargs.get('transition_cache', None)
+        if isinstance(transition_cache, int) and transition_cache > 0:
+            transition_cache = TransitionCache(transition_cache)
+        self.transition_cache = transition_cache or None
+
+        # end the episode in the states that can't be solved anymore (see _is_dead)
+        self.detect_dead = kwargs.get('detect_dead', False)
+        self.is_dead = False
+
         self.reset()
         
 
+    @property
+    def action_space(self):
+        # Actions are discrete integer values
+        if getattr(self, '_action_space', None) is None:
+            from gym import spaces
+            self._action_space = spaces.Discrete(len(self.actions))
+        return self._action_space
+
+    @property
+    def observation_space(self):
+        if getattr(self, '_observation_space', None) is None:
+            from gym import spaces
+            self._observation_space = spaces.Box(
+                low=0,
+                high=255,
+                shape=(self.width, self.height, 1 * self.encoding_level),
+                dtype="uint8",
+            )
+        return self._observation_space
+
+    @property
+    def np_random(self):
+        if getattr(self, '_np_random', None) is None:
+            self._np_random = np.random.default_rng()
+        return self._np_random
+
+    @property
+    def unwrapped(self):
+        return self
+
     def get_ruleset(self):
         return self._ruleset
 
     def reset(self, *, seed=None, return_info=False, options=None):
-        try:
-            super().reset(seed=seed)
-        except TypeError:
-            # gym==0.21 reset not implemented in gym.Env
-            pass
+        if seed is not None:
+            self._np_random = np.random.default_rng(seed)
 
         # Current position and direction of the agent
         self.agent_pos = None
         self.agent_dir = None
 
-        # Generate a new random grid at the start of each episode
-        self._gen_grid(self.width, self.height)
-
-        # Set the encoding level for the grid
-        self.grid.encoding_level = self.encoding_level
-
-        # Compute the ruleset for the generated grid
-        self._ruleset = extract_ruleset(self.grid, default_ruleset=self.default_ruleset)
-
-        self._ruleset = Ruleset(self._ruleset)
-        self.grid._ruleset = self._ruleset
-        for e_list in self.grid.grid:
-            for e in e_list:
-                if hasattr(e, "set_ruleset"):
-                    e.set_ruleset(self._ruleset)
+        key = self.level_key()
+        if key is not None:
+            key = (type(self), key, self.encoding_level)
+        template = LEVEL_TEMPLATES.get(key) if key is not None else None
+        if template is not None:
+            LEVEL_TEMPLATES.move_to_end(key)
+            # copy the compiled level, the objects of the copy share a new ruleset
+            self.grid = template.copy()
+            self._ruleset = self.grid._ruleset
+            self._ruleset.set(extract_ruleset(self.grid, default_ruleset=self.default_ruleset))
+        else:
+            # Generate a new random grid at the start of each episode
+            self._gen_grid(self.width, self.height)
+
+            # Set the encoding level for the grid
+            self.grid.encoding_level = self.encoding_level
+
+            # Compute the ruleset for the generated grid
+            self._ruleset = extract_ruleset(self.grid, default_ruleset=self.default_ruleset)
+
+            self._ruleset = Ruleset(self._ruleset)
+            self.grid._ruleset = self._ruleset
+            for e_list in self.grid.grid:
+                for e in e_list:
+                    if hasattr(e, "set_ruleset"):
+                        e.set_ruleset(self._ruleset)
+            if key is not None:
+                LEVEL_TEMPLATES[key] = self.grid.copy()
+                if len(LEVEL_TEMPLATES) > MAX_LEVEL_TEMPLATES:
+                    LEVEL_TEMPLATES.popitem(last=False)
 
         self.agent_pos = self.set_agent()
 
@@ -452,17 +931,26 @@ class BabaIsYouEnv(gym.Env):
 
         # Step count since episode start
         self.step_count = 0
+        self._undo_stack = []
         # Return first observation
         obs = self.gen_obs()
 
         self.is_win = False
         self.is_lose = False
+        self.is_dead = False
 
         if not return_info:
             return obs
         else:
             return obs, {}
 
+    def level_key(self):
+        """
+        Hashable key identifying the grid generated by _gen_grid, None if it isn't always the same. The envs with a key
+        generate the grid once and reset by copying it
+        """
+        return None
+
     def set_grid(self, grid):
         # Set the encoding level for the grid
         self.grid = grid
@@ -476,19 +964,88 @@ class BabaIsYouEnv(gym.Env):
                     e.set_ruleset(self._ruleset)
         self._ruleset.set(extract_ruleset(self.grid))
         self.agent_pos = self.set_agent()
+        self._undo_stack = []
+
+    def get_state(self):
+        """
+        Return an immutable snapshot of the state of the env: the grid planes, the agent, the step count, win/lose and the
+        ruleset. Restored with set_state (the objects of the restored cells get their default color).
+        """
+        grid = self.grid
+        return EnvState(
+            shape=grid.types.shape,
+            types=grid.types.tobytes(),
+            dirs=grid.dirs.tobytes(),
+            ids=grid.ids.tobytes(),
+            heights=grid.heights.tobytes(),
+            assumptions=tuple(grid.assumptions),
+            ruleset=pickle.dumps(self._ruleset.ruleset_dict),
+            agent_pos=None if self.agent_pos is None else (int(self.agent_pos[0]), int(self.agent_pos[1])),
+            agent_dir=self.agent_dir,
+            step_count=self.step_count,
+            is_win=self.is_win,
+            is_lose=self.is_lose,
+        )
+
+    def set_state(self, state: EnvState):
+        """
+        Restore a snapshot returned by get_state. Only the cells that differ from the current grid are rebuilt.
+        """
+        width, height, depth = state.shape
+        assert (width, height) == (self.grid.width, self.grid.height)
+        if state.ruleset != pickle.dumps(self._ruleset.ruleset_dict):
+            self._ruleset.set(pickle.loads(state.ruleset))
+        grid = self.grid
+        if (state.shape != grid.types.shape or state.types != grid.types.tobytes() or state.dirs != grid.dirs.tobytes()
+                or state.ids != grid.ids.tobytes() or state.heights != grid.heights.tobytes()):
+            grid.load_planes(
+                np.frombuffer(state.types, dtype=np.uint8).reshape(state.shape),
+                np.frombuffer(state.dirs, dtype=np.uint8).reshape(state.shape),
+                np.frombuffer(state.ids, dtype=np.int16).reshape(state.shape),
+                np.frombuffer(state.heights, dtype=np.uint8).reshape((width, height)),
+                ruleset=self._ruleset,
+            )
+        grid.assumptions = list(state.assumptions)
+        self.agent_pos = state.agent_pos
+        self.agent_dir = state.agent_dir
+        self.step_count = state.step_count
+        self.is_win = state.is_win
+        self.is_lose = state.is_lose
+        self.is_dead = False
+        self._undo_stack = []
+
+    def undo(self):
+        """
+        Revert the last step (only if the env was created with undo=True). Takes a time proportional to the number of
+        changes made by the step.
+        Returns:
+            the observation before the step
+        """
+        if len(self._undo_stack) == 0:
+            raise ValueError("No step to undo")
+        journal, ruleset, agent_fields = self._undo_stack.pop()
+        self.grid.revert(journal)
+        if self._ruleset.version != ruleset['version']:
+            self._ruleset.__dict__.update(ruleset)
+        self.agent_pos, self.agent_dir, self.step_count, self.is_win, self.is_lose = agent_fields
+        self.is_dead = False
+        return self.gen_obs()
 
     def hash(self, size=16):
         """
         Compute a hash that uniquely identifies the current state of the environment.
         :param size: Size of the hashing
         """
-        sample_hash = hashlib.sha256()
-        # TODO: make the agent part of the grid encoding
-        to_encode = [self.grid.encode().tolist(), self.agent_pos, self.agent_dir]
-        for item in to_encode:
-            sample_hash.update(str(item).encode("utf8"))
+        return format(self._state_hash(), "016x")[:size]
 
-        return sample_hash.hexdigest()[:size]
+    def _state_hash(self):
+        h = self.grid.hash()
+        if self.agent_pos is not None:
+            i, j = self.agent_pos
+            h ^= zobrist_keys(1, self.width * self.height)[int(j) * self.width + int(i)]
+        if self.agent_dir is not None:
+            h ^= AGENT_DIR_KEYS[self.agent_dir]
+        return h
 
     @property
     def steps_remaining(self):
@@ -551,9 +1108,11 @@ class BabaIsYouEnv(gym.Env):
         Set the agent's starting point at an empty position in the grid
         """
         pos = None
-        for k, e in enumerate(self.grid):
-            if e is not None and e.is_agent():
-                pos = (k % self.grid.width, k // self.grid.width)
+        agent_types = [obj_type for obj_type, is_agent in self._ruleset.get('is_agent', {}).items() if is_agent]
+        for p in self.grid.positions(agent_types, top=True):
+            e = self.grid.get(*p)
+            if e.is_agent():
+                pos = p
                 self.agent_pos = pos
                 self.agent_dir = e.dir
                 break
@@ -591,7 +1150,8 @@ class BabaIsYouEnv(gym.Env):
         """
         Change the position and the direction of an object in the grid
         """
-        if np.any(pos != new_pos):
+        pos, new_pos = (int(pos[0]), int(pos[1])), (int(new_pos[0]), int(new_pos[1]))
+        if pos != new_pos:
             # move the object
             if under:
                 e = self.grid.get_under(*pos)
@@ -608,7 +1168,7 @@ class BabaIsYouEnv(gym.Env):
                 self.grid.set(*pos, None)
             # change the dir of the object
             if mvt_dir is not None:
-                e.dir = np.argwhere(np.all(DIR_TO_VEC == mvt_dir, axis=1))[0][0]
+                self.grid.set_dir(e, VEC_TO_DIR[int(mvt_dir[0]), int(mvt_dir[1])])
 
     def is_win_pos(self, pos):
         new_cell = self.grid.get(*pos)
@@ -627,31 +1187,89 @@ class BabaIsYouEnv(gym.Env):
 
     def move(self, pos, dir_vec, under=False):
         """
-        Return fwd_pos if can move, otherwise return pos
+        Return fwd_pos if can move, otherwise return pos. The pushable objects in front are found by a forward scan and
+        the chain is then shifted starting from its far end
         """
-        
-        fwd_pos = pos + dir_vec
-        fwd_cell = self.grid.get(*fwd_pos)
-
-        # try to move the forward obj if it can be pushed
-        if fwd_cell is not None and fwd_cell.is_push():
-            new_fwd_pos, _, _ = self.move(fwd_pos, dir_vec)
-
-        # move if the fwd cell is empty or can overlap
-        fwd_cell = self.grid.get(*fwd_pos)
-        if fwd_cell is None or fwd_cell.can_overlap():
-            new_pos = tuple(fwd_pos)
-        else:
-            new_pos = pos
+        dx, dy = int(dir_vec[0]), int(dir_vec[1])
+        chain = [(int(pos[0]), int(pos[1]))]
+        fwd_cell = self.grid.get(chain[-1][0] + dx, chain[-1][1] + dy)
+        while fwd_cell is not None and fwd_cell.is_push():
+            chain.append((chain[-1][0] + dx, chain[-1][1] + dy))
+            fwd_cell = self.grid.get(chain[-1][0] + dx, chain[-1][1] + dy)
+
+        # an object moves if the cell in front is empty or can overlap once the objects in front of it have moved
+        for k in range(len(chain) - 1, -1, -1):
+            pos = chain[k]
+            fwd_pos = (pos[0] + dx, pos[1] + dy)
+            fwd_cell = self.grid.get(*fwd_pos)
+            if fwd_cell is None or fwd_cell.can_overlap():
+                new_pos = fwd_pos
+            else:
+                new_pos = pos
+            if k > 0:
+                self.change_obj_pos(pos, new_pos, (dx, dy))
 
-        # check if win or lose before moving the agent
+        # check if win or lose before moving the object
         is_win = self.is_win_pos(new_pos)
         is_lose = self.is_lose_pos(new_pos)
-        self.change_obj_pos(pos, new_pos, dir_vec, under)
+        self.change_obj_pos(pos, new_pos, (dx, dy), under)
 
         return new_pos, is_win, is_lose
 
-    def step(self, action):
+    def step(self, action, observe=True):
+        """
+        With observe=False the observation isn't computed and None is returned instead, for the callers that only need
+        the simulation (the grid stays available in self.grid)
+        """
+        reward, done = self._step(action)
+        obs = self.gen_obs() if observe else None
+        info = {'is_dead': True} if self.is_dead else {}
+        return obs, reward, done, info
+
+    def _step(self, action):
+        """
+        Step without computing the observation, returns the reward and done
+        """
+        if self.transition_cache is not None and not self.record_undo:
+            return self._cached_step(action)
+        if self.record_undo:
+            self._undo_stack.append((
+                [], dict(self._ruleset.__dict__),
+                (self.agent_pos, self.agent_dir, self.step_count, self.is_win, self.is_lose)
+            ))
+            self.grid._journal = self._undo_stack[-1][0]
+            try:
+                return self._update(action)
+            finally:
+                self.grid._journal = None
+        return self._update(action)
+
+    def _cached_step(self, action):
+        """
+        Step by restoring the next state from the transition cache, computed with _update on a miss. The reward and
+        the step limit depend on the step count, so they are computed from the restored state.
+        """
+        acted = action != self.actions.idle and not self.is_lose
+        # the Zobrist hash only covers the object types: the directions (MOVE objects move along theirs) and the ids
+        # are part of the key too, so that the restored state is exactly the one computed from this state
+        grid = self.grid
+        key = (self._state_hash(), grid.dirs.tobytes(), grid.ids.tobytes(), self.is_win, self.is_lose, int(action))
+        state = self.transition_cache.get(key)
+        if state is None:
+            reward, done = self._update(action)
+            self.transition_cache.put(key, self.get_state())
+            return reward, done
+
+        step_count = self.step_count + 1
+        self.set_state(state)
+        self.step_count = step_count
+        reward, done = self.reward() if acted else (0, False)
+        done = self._check_dead(done)
+        if self.step_count >= self.max_steps:
+            done = True
+        return reward, done
+
+    def _update(self, action):
         self.step_count += 1
 
         is_win, is_lose = False, False
@@ -668,41 +1286,52 @@ class BabaIsYouEnv(gym.Env):
             self.agent_dir = 2
             
         dir = self.agent_dir
-        move_dir = DIR_TO_VEC[self.agent_dir]
+        move_dir = DIR_TO_TUPLE[self.agent_dir]
 
         if action != self.actions.idle and not(self.is_lose):
-            # move the agent if the forward cell is empty or can overlap or can be pushed
-            for i in range(self.grid.width):
-                for j in range(self.grid.height):
-                    pos = (i, j)
-                    e_list = self.grid.get(*pos, 'all')
-                    for e in e_list:
-                        if e is not None and (e.is_agent() or e.is_move()):
-                            e.has_moved = False            
-
-            # Move avatar, dealing with multiple avatars by ordering movements based on direction moved
-            i_list = list(range(self.grid.width))
-            j_list = list(range(self.grid.height))
+            # only the cells with agents or moving objects are visited, using the positions indexed by the grid
+            agent_types = self._ruleset.types['is_agent']
+            mover_types = self._ruleset.types['is_move']
+            for pos in self.grid.positions(agent_types + mover_types):
+                for e in self.grid.get(*pos, 'all'):
+                    if e is not None and (e.is_agent() or e.is_move()):
+                        e.has_moved = False
+
+            # Move avatar, dealing with multiple avatars by ordering movements based on direction moved (the cells are
+            # visited column by column, going through the columns and rows in the direction of the movement)
             if self.agent_dir == 0:
-                i_list.reverse()
+                order = lambda pos: (-pos[0], pos[1])
             elif self.agent_dir == 1:
-                j_list.reverse() 
-            for i in i_list:
-                for j in j_list:
-                    pos = (i, j)
-                    e_list = self.grid.get(*pos, 'all')
-                    for (e_idx, e) in enumerate(e_list):
-                        if e is not None and e.is_agent() and not e.has_moved:
-                            e.dir = dir
-                            new_pos, is_win, is_lose = self.move(pos, move_dir, e_idx<len(e_list)-1)
-                            e.has_moved = True
-                            self.agent_pos = new_pos 
-                 
-            # move other objects
-            for k, e in enumerate(self.grid):
-                if e is not None and e.is_move() and not e.has_moved:
-                    pos = (k % self.grid.width, k // self.grid.width)
-                    new_pos, _, _ = self.move(pos, DIR_TO_VEC[e.dir])
+                order = lambda pos: (pos[0], -pos[1])
+            else:
+                order = lambda pos: pos
+            last = None
+            while True:
+                # next cell with an agent (agents can be pushed to cells that haven't been visited yet)
+                cells = [p for p in self.grid.positions(agent_types) if last is None or order(p) > last]
+                if len(cells) == 0:
+                    break
+                pos = min(cells, key=order)
+                last = order(pos)
+                e_list = self.grid.get(*pos, 'all')
+                for (e_idx, e) in enumerate(e_list):
+                    if e is not None and e.is_agent() and not e.has_moved:
+                        self.grid.set_dir(e, dir)
+                        new_pos, is_win, is_lose = self.move(pos, move_dir, e_idx<len(e_list)-1)
+                        e.has_moved = True
+                        self.agent_pos = new_pos 
+
+            # move other objects, row by row
+            last = None
+            while True:
+                cells = [(j, i) for (i, j) in self.grid.positions(mover_types, top=True) if last is None or (j, i) > last]
+                if len(cells) == 0:
+                    break
+                last = min(cells)
+                pos = (last[1], last[0])
+                e = self.grid.get(*pos)
+                if e.is_move() and not e.has_moved:
+                    new_pos, _, _ = self.move(pos, DIR_TO_TUPLE[e.dir])
                     e.has_moved = True
 
             # win/lose based on the rules active in the env
@@ -715,18 +1344,72 @@ class BabaIsYouEnv(gym.Env):
             for (obj1, obj2) in self._ruleset.get('replace', []):
                 self.grid.replace(obj1, obj2)
             # are we at a winning pos after all blocks have moved?
-            for k, e in enumerate(self.grid):
-                if e is not None and e.is_agent():
-                    if self.is_win_pos(e.cur_pos):
-                        self.is_win = True
+            for pos in self.grid.positions(self._ruleset.types['is_agent'], top=True):
+                if self.is_win_pos(pos):
+                    self.is_win = True
             
             reward, done = self.reward()
 
+        done = self._check_dead(done)
         if self.step_count >= self.max_steps:
             done = True
 
-        obs = self.gen_obs()
-        return obs, reward, done, {}
+        return reward, done
+
+    def _check_dead(self, done):
+        self.is_dead = self.detect_dead and not done and self._is_dead()
+        return done or self.is_dead
+
+    def _is_dead(self):
+        """
+        The level can't be solved anymore if nothing moves on its own (that could change the rules) and no object is
+        YOU or all the YOU objects are enclosed by STOP objects that can't be pushed. Uses the object index of the
+        grid, only the cells around the YOU objects are visited.
+        """
+        present = self.grid.object_types()
+        if any(t in present for t in self._ruleset.types['is_move']):
+            return False
+        agent_types = [t for t in self._ruleset.types['is_agent'] if t in present]
+        if len(agent_types) == 0:
+            return True
+
+        def blocked(i, j):
+            if not (0 <= i < self.grid.width and 0 <= j < self.grid.height):
+                return True
+            e = self.grid.get(i, j)
+            return (e is not None and not e.can_overlap() and not e.is_push() and not e.is_agent()
+                    and not e.is_move())
+
+        return all(
+            blocked(i + dx, j + dy) for (i, j) in self.grid.positions(agent_types) for (dx, dy) in DIR_TO_TUPLE
+        )
+
+    def rollout(self, actions):
+        """
+        Replay a sequence of actions from the current state, writing the observations into arrays allocated once.
+        RESET_ACTION resets the level and GIVE_UP_ACTION leaves the env unchanged and sets done.
+        Returns:
+            Rollout with obs[0] the current observation and obs[t+1] the observation after actions[t], agent_pos being
+            (-1, -1) when there is no agent
+        """
+        n_steps = len(actions)
+        obs = np.empty((n_steps + 1, self.width, self.height, self.encoding_level), dtype=np.uint8)
+        reward = np.zeros(n_steps, dtype=np.float64)
+        done = np.zeros(n_steps, dtype=bool)
+        agent_pos = np.empty((n_steps + 1, 2), dtype=np.int64)
+
+        self.grid.encode(out=obs[0])
+        agent_pos[0] = self.agent_pos if self.agent_pos is not None else (-1, -1)
+        for t, action in enumerate(actions):
+            if action == RESET_ACTION:
+                self.reset()
+            elif action == GIVE_UP_ACTION:
+                done[t] = True
+            else:
+                reward[t], done[t] = self._step(action)
+            self.grid.encode(out=obs[t+1])
+            agent_pos[t+1] = self.agent_pos if self.agent_pos is not None else (-1, -1)
+        return Rollout(obs, reward, done, agent_pos)
 
     def reward(self):
         if self.is_win:
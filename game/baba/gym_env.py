@@ -0,0 +1,25 @@
+"""
+Gym interface of the environments. The simulation (grid.py) only depends on numpy, this module is only needed to use the
+environments with gym tools.
+"""
+import gym
+
+from .grid import BabaIsYouEnv
+from . import registration
+
+
+class GymEnv(gym.Wrapper):
+    """
+    Wrap a BabaIsYouEnv in a gym.Env
+    """
+    def __init__(self, env: BabaIsYouEnv):
+        super().__init__(env)
+
+
+def make(id, *args, **kwargs):
+    """
+    Make a registered environment wrapped in a gym.Env, id can't be a wildcard
+    """
+    if not registration.is_registered(id) and len(registration.match(id)) > 0:
+        raise ValueError(f"`{id}` is a wildcard, gym_env.make takes the id of a single environment")
+    return GymEnv(registration.make(id, True, *args, **kwargs))
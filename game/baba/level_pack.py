@@ -0,0 +1,104 @@
+"""
+Level packs: text files storing the grids of many levels.
+
+Each level is a header line "= <name>" followed by the rows of its grid, one token per cell separated by spaces
+("." for an empty cell, the other tokens are those of my_envs.str_to_obj), and ends with a blank line. Lines starting
+with "#" are comments.
+
+The packs written by save start with an index, one line "@ <offset of the header of the level> <name>" per level, so
+that indexing a pack only reads the index and not the grids. A pack without index (e.g. written by hand) is indexed by
+scanning all its lines for the headers.
+"""
+import os
+
+
+DEFAULT_PACK = os.path.join(os.path.dirname(__file__), "levels.txt")
+EMPTY = "."
+# number of digits of the offsets in the index, fixed so that the size of the index doesn't depend on the offsets
+OFFSET_DIGITS = 10
+
+# path -> {level name: offset of the header of the level in the file}
+_indexes = {}
+
+
+def index(path):
+    """
+    Offsets of the levels of the pack by name, cached
+    """
+    if path not in _indexes:
+        offsets = {}
+        indexed = False
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if line.startswith(b"@"):
+                    indexed = True
+                    _, level_offset, name = line.decode().rstrip("\n").split(" ", 2)
+                    offsets[name] = int(level_offset)
+                elif line.startswith(b"="):
+                    if indexed:
+                        break
+                    name = line[1:].strip().decode()
+                    assert name not in offsets, f"Level `{name}` is defined twice in {path}"
+                    offsets[name] = offset
+                offset += len(line)
+        _indexes[path] = offsets
+    return _indexes[path]
+
+
+def load(path, name):
+    """
+    Grid of the level `name` of the pack, list of rows of tokens (GridArrEnv grid_arr)
+    """
+    grid_arr = []
+    with open(path, "rb") as f:
+        f.seek(index(path)[name])
+        if f.readline().decode().strip() != f"= {name}":
+            raise ValueError(f"The index of {path} is out of date, rewrite the pack with level_pack.save")
+        for line in f:
+            line = line.decode().strip()
+            if not line:
+                break
+            if not line.startswith("#"):
+                grid_arr.append([" " if token == EMPTY else token for token in line.split()])
+    return grid_arr
+
+
+def save(path, levels, comment=None):
+    """
+    Write an indexed pack. Args:
+        levels: dict level name -> grid (list of rows of tokens)
+        comment: text written as comment lines at the top of the file
+    """
+    head = "".join(f"# {line}\n" for line in comment.splitlines()) if comment is not None else ""
+    blocks = []
+    for name, grid_arr in levels.items():
+        rows = "".join(" ".join(EMPTY if token == " " else token for token in row) + "\n" for row in grid_arr)
+        blocks.append(f"= {name}\n{rows}\n")
+
+    # the index is followed by a blank line
+    offset = len(head.encode()) + sum(len(f"@ {0:0{OFFSET_DIGITS}d} {name}\n".encode()) for name in levels) + 1
+    lines = []
+    for name, block in zip(levels, blocks):
+        lines.append(f"@ {offset:0{OFFSET_DIGITS}d} {name}\n")
+        offset += len(block.encode())
+    with open(path, "w", newline="\n") as f:
+        f.write(head + "".join(lines) + "\n" + "".join(blocks))
+    _indexes.pop(path, None)
+
+
+class PackLevel:
+    """
+    Registry entry of a level of a pack, makes an env of the class of the level (see my_envs.level_class)
+    """
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+
+    def __call__(self, **kwargs):
+        from .my_envs import level_class
+
+        return level_class(self.path, self.name)(**kwargs)
+
+    def __repr__(self):
+        return f"PackLevel({self.path!r}, {self.name!r})"
@@ -1,5 +1,6 @@
 from .grid import BabaIsYouGrid, BabaIsYouEnv
 from .world_object import make_obj, RuleObject, RuleIs, RuleProperty
+from . import level_pack
 
 
 def put_obj(env, obj, pos):
@@ -62,6 +63,9 @@ class GridArrEnv(BabaIsYouEnv):
         height = len(self.grid_arr)
         super().__init__(width=width, height=height, **kwargs)
 
+    def level_key(self):
+        return tuple(tuple(row) for row in self.grid_arr)
+
     def _gen_grid(self, width, height, params=None):
         self.grid = BabaIsYouGrid(width, height)
         for row in range(len(self.grid_arr)):
@@ -69,703 +73,48 @@ class GridArrEnv(BabaIsYouEnv):
                 obj = str_to_obj(self.grid_arr[row][col])
                 if obj != "empty":
                     put_obj(self, obj, (col, row))
-     
-class Env1D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "R", "I", "Wi","x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", "b", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "r", " ", " ", " ", " ", " ", "B", "I", "U", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-
-class Env1D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "R", "I", "Wi", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "F", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", "G", " ", "x"],
-            ["x", " ", "k", " ", " ", " ", "g", " ", "b", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "f", "x"],
-            ["x", "f", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "r", " ", " ", " ", " ", " ", "B", "I", "U", "x"],
-            ["x", " ", " "," ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-
-class Env2D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", "R", "I", "Wi", "x"],
-            ["x", "W", "I", "S", " ", "w", " ", "F", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", "b", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "f", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "r", " ", "w", " ", " ", " ", "B", "I", "U", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-
-class Env2D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", "R", "I", "Wi", "x"],
-            ["x", "W", "I", "S", " ", "w", " ", "F", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", "g", "x"],
-            ["x", " ", " ", "K", " ", "w", "g", " ", "b", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "f", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", "G", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "r", " ", "w", " ", " ", " ", "B", "I", "U", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-
-class Env3D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", "B", " ", " ", " ", " ", " ", " ", " ", " ", "K", "x"],
-            ["x", " ", "I", " ", " ", "I", " ", " ", " ", " ", " ", "I", "x"],
-            ["x", " ", "U", " ", " ", " ", " ", " ", " ", "b", " ", "Wi","x"],
-            ["x", " ", " ", " ", " ", " ", " ", "Fl"," ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "g", "g", "g", "g", "g", "g", "g", "g", "g", "g", "g", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "k", " ", " ", " ", " ", " ", " ", "G", "I", "Si","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-        
-class Env3D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", "B", " ", " ", " ", " ", " ", "r", " ", " ", "K", "x"],
-            ["x", " ", "I", " ", " ", "I", " ", " ", " ", " ", " ", "I", "x"],
-            ["x", " ", "U", " ", " ", " ", " ", " ", " ", "b", " ", "Wi","x"],
-            ["x", " ", " ", "Si", " ", "f", " ", "Fl", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "g", "g", "g", "g", "g", "g", "g", "g", "g", "g", "g", "x"],
-            ["x", " ", " ", "w", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "W", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "k", " ", " ", " ", " ", " ", " ", "G", "I", "Si", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-       
-class Env4D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "Wi","x"],
-            ["x", "B", "I", "U", " ", "I", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "b", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "r", " ", " ", " ", " ", " ", "R", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-        
-class Env4D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", "G", " ", " ", " ", " ", " ", " ", " ", " ", "Wi","x"],
-            ["x", "B", "I", "U", " ", "I", " ", " ", "k", " ", " ", " ", "x"],
-            ["x", " ", "Si"," ", " ", " ", " ", "Fl"," ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "b", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "f", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "K", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "r", " ", " ", "w", "w", "w", "R", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-        
-class Env5D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "R", " "," ", "w", " ", " ", " ", "W", "I", "S", "x"],
-            ["x", " ", "I", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "Wi"," ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", "b", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "r", " ", "w", " ", " ", " ", "B", "I", "U", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-
-class Env5D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", "w", "f", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "R", " ", " ", "w", " ", " ", " ", "W", "I", "S", "x"],
-            ["x", " ", "I", " ", " ", "w", " ", "Fl"," ", " ", " ", " ", "x"],
-            ["x", " ", "Wi"," ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "g", "g", " ", "w", " ", " ", "b", " ", "F", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "k", " ", "r", " ", "w", " ", " ", " ", "B", "I", "U", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-
-class Env6D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", " ", "I", " ", " ", " ", " ", "W", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "I", "x"],
-            ["x", " ", " ", " ", "k", " ", " ", " ", " ", " ", " ", "Wi","x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", "b", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "K", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "B", "I", "U", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
 
-class Env6D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", " ", "I", " ", " ", " ", " ", "W", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", "r", " ", " ", "I", "x"],
-            ["x", "R", " ", " ", "k", " ", " ", " ", " ", " ", " ", "Wi","x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", "b", " ", " ", " ", "x"],
-            ["x", " ", " ", "g", "g", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "K", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", "Fl", " ", " ", " ", " ", "B", "I", "U","x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
 
-class Env7D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "F", "I", "Wi"," ", " ", "f", " ", " ", "G", "I", "Si","x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "w", "w", "w", "w", "w", "w", "w", "w", "w", "w", "w", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "g", "g", "g", "g", "g", "g", "g", "g", "g", "g", "g", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "W", " ", " ", " ", " ", " ", " ", "b", " ", "x"],
-            ["x", " ", " ", " ", " ", "B", "I", "U", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
+# GridArrEnv subclass of each level by (pack path, level name)
+_level_classes = {}
 
-class Env7D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "F", "I", "Wi"," ", " ", "f", " ", " ", "G", "I", "Si","x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "w", "w", "w", "w", "w", "w", "w", "w", "w", "w", "w", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "g", "g", "g", "g", "g", "g", "g", "g", "g", "g", "g", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "W", " ", " ", " ", " ", " ", " ", "b", " ", "x"],
-            ["x", " ", "S", " ", " ", "B", "I", "U", " ", "Fl", " ", " ","x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
 
-class Env8D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "F", "I", "Wi"," ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", "B", "I", "U", " ", " ", "x"],
-            ["x", "f", " ", " ", " ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", "r", "R", " ", " ", " ", "x"],
-            ["x", "R", "I", "Fl","g", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", "g", " ", " "," ", "b", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", "g", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "G", "I", "Si","g", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)  
+def level_class(path, name):
+    """
+    GridArrEnv subclass named after the level `name` of the pack, created once per level so that the envs of a level
+    have the same type whether they come from the registry or from this module
+    """
+    key = (path, name)
+    if key not in _level_classes:
+        grid_arr = level_pack.load(path, name)
 
-class Env8D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "F", "I", "Wi"," ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", "B", "I", "U", " ", " ", "x"],
-            ["x", "f", " ", " ", " ", "g", " ", " ", " ", " ", " ", "K", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", "r", "R", " ", " ", " ", "x"],
-            ["x", "R", "I", "Fl","g", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", "g", " ", " ", " ", "b", " ", "Fl"," ", "x"],
-            ["x", " ", " ", " ", "g", " ", "w", "w", " ", " ", " ", " ", "x"],
-            ["x", "G", "I", "Si","g", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)  
+        def __init__(self, **kwargs):
+            GridArrEnv.__init__(self, grid_arr=grid_arr, **kwargs)
 
-class Env9D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "R", " ", " ", " ", "g", " ", "B", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", "I", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "I", " ", "g", " ", "U", " ", " ", "Fl", " ","x"],
-            ["x", " ", " ", " ", " ", "g", " ", " ", "b", " ", " ", " ", "x"],
-            ["x", " ", "Wi"," ", " ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "r", " ", "g", " ", " ", " ", "I", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "G", "I", "Si", " ","g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
+        def __reduce__(self):
+            # the envs are pickled with their level, the path being left out for the default pack so that the pickles
+            # can be loaded from another checkout
+            args = (name,) if path == level_pack.DEFAULT_PACK else (name, path)
+            return _new_level_env, args, self.__dict__
 
-class Env9D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", " ", " ", " ", "f", " ", "x"],
-            ["x", "R", " ", " ", " ", "g", " ", "B", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", "I", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "I", " ", "g", " ", "U", " ", " ", "Fl", " ","x"],
-            ["x", " ", " ", " ", " ", "g", "w", "w", "b", " ", " ", " ", "x"],
-            ["x", " ", "Wi"," ", "K", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "r", " ", "g", " ", " ", " ", "I", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", "S", " ", " ", " ", " ", "x"],
-            ["x", "G", "I", "Si", " ","g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
+        _level_classes[key] = type(name, (GridArrEnv,), {
+            "__init__": __init__, "__reduce__": __reduce__, "__module__": __name__, "__qualname__": name,
+        })
+    return _level_classes[key]
 
-class Env10D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "b", " ", " ", " ", "w", " ", " ", "r", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "w", " ", "W", " ", " ", " ", "x"],
-            ["x", " ", "B", "I", "U", " ", "w", " ", "I", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "w", "w", "S"," ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", "R", " ", "w", "w", "w", "w", "w", "w", "w", "w", "x"],
-            ["x", " ", " ", " ", "w", " ", " ", "k", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", "w", " ", " ", " ", " ", "K", "I", "Wi","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs) 
-        
-class Env10D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "b", " ", " ", " ", "w", " ", "g", "r", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "w", " ", "W", " ", " ", "F", "x"],
-            ["x", " ", "B", "I", "U", " ", "w", " ", "I", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "w", "w", "S", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", "f", " ", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", "R", " ", "w", "w", "w", "w", "w", "w", "w", "w", "x"],
-            ["x", " ", " ", " ", "w", " ", " ", "k", " ", " ", " ", " ", "x"],
-            ["x", "G", " ", " ", "w", " ", " ", " ", " ", "K", "I", "Wi","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-        
-class Env11D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "R", " ", " ", " ", "I", " ", " ", " ", "Wi"," ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "B", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "R", " ", " ", " ", "I", "x"],
-            ["x", " ", " ", " ", "g", " ", " ", " ", " ", " ", " ", "U", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "b", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "G", " ", " ", "I", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
 
-class Env11D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "R", " ", " ", " ", "I", " ", " ", " ", "Wi"," ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "B", "x"],
-            ["x", " ", "w", "w", " ", " ", " ", "R", " ", "Fl"," ", "I", "x"],
-            ["x", " ", " ", " ", "g", " ", " ", " ", " ", " ", " ", "U", "x"],
-            ["x", " ", "f", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "b", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "G", " ", " ", "I", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-        
-class Env12D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "B", " ", " ", " ", " ", "g", " ", " ", "R", " ", "W", "x"],
-            ["x", "I", " ", " ", "b", " ", "g", " ", " ", " ", " ", "I", "x"],
-            ["x", "U", " ", " ", " ", " ", "g", " ", " ", " ", " ", "Wi","x"],
-            ["x", " ", " ", " ", " ", "g", "g", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", " ", " ", "r", " ", " ", "x"],
-            ["x", "G", "I", "Si"," ", "g", "g", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "g", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "g", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-             
-class Env12D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "B", " ", " ", " ", " ", "g", " ", " ", "R", " ", "W", "x"],
-            ["x", "I", " ", "S", "b", " ", "g", " ", " ", " ", " ", "I", "x"],
-            ["x", "U", " ", " ", " ", " ", "g", " ", " ", " ", " ", "Wi","x"],
-            ["x", " ", " ", " ", " ", "g", "g", " ", "U", " ", " ", " ", "x"],
-            ["x", " ", " ", "K", " ", "g", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "g", " ", "Fl", " ", "r", " ", " ", "x"],
-            ["x", "G", "I", "Si"," ", "g", "g", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "g", "f", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "g", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-   
-class Env13D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", "W", "I", "S", "x"],
-            ["x", " ", " ", "Wi"," ", "w", "b", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "f", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "F", " ", " ", "w", " ", " ", " ", "F", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", "B", "I", "U", " ", "x"],
-            ["x", " ", "I", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)   
-    
-class Env13D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", "W", "I", "S", "x"],
-            ["x", " ", " ", "Wi"," ", "w", "b", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "f", " ", " ", "w", " ", " ", "k", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "F", " ", " ", "w", " ", " ", " ", "F", " ", " ", "x"],
-            ["x", " ", " ", "B", " ", "w", " ", " ", "B", "I", "U", " ", "x"],
-            ["x", " ", "I", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "g", " ", "w", " ", "Fl"," ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)     
-      
-class Env14D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", " ", "g", " ", "K", " ", " ", "F", "x"],
-            ["x", "B", "I", "U", " ", " ", "g", " ", " ", " ", " ", "I", "x"],
-            ["x", " ", " ", " ", " ", " ", "g", " ", " ", " ", " ", "Wi","x"],
-            ["x", " ", "b", " ", " ", " ", "g", "g", " ", "r", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "R", " ", "g", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "g", " ", " ", "I", " " ,"x"],
-            ["x", " ", " ", " ", " ", " ", " ", "g", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "g", " ", "k", " ", " ", "x"],
-            ["x", "G", "I", "Si"," ", " ", " ", "g", " ", " ", " ", " ","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)   
-          
-class Env14D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", "F", " ", "g", " ", "K", " ", " ", "F", "x"],
-            ["x", "B", "I", "U", " ", " ", "g", " ", " ", " ", " ", "I", "x"],
-            ["x", " ", " ", " ", " ", " ", "g", " ", "W", " ", " ", "Wi","x"],
-            ["x", " ", "b", " ", " ", " ", "g", "g", " ", "r", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "R", " ", "g", " ", " ", " ", " ", "x"],
-            ["x", "I", " ", " ", " ", " ", " ", "g", " ", " ", "I", " " ,"x"],
-            ["x", " ", " ", " ", " ", "w", " ", "g", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", "g", " ", "k", " ", " ", "x"],
-            ["x", "G", "I", "Si"," ", "w", " ", "g", " ", " ", " ", " ","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)   
-    
-class Env15D0(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", "W", " ", " ", "w", " ", " ", " ", "F", "x"],
-            ["x", " ", " ", " ", "I", " ", " ", "w", " ", " ", " ", "I", "x"],
-            ["x", " ", " ", " ", "S", " ", " ", "w", " ", " ", " ", "Wi","x"],
-            ["x", " ", "b", " ", " ", " ", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "w", " ", " ", " ", " " ,"x"],
-            ["x", " ", " ", " ", " ", " ", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "B", "I", "U", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)   
-    
-class Env15D1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", "W", " ", " ", "w", " ", " ", " ", "F", "x"],
-            ["x", " ", " ", " ", "I", " ", " ", "w", " ", " ", " ", "I", "x"],
-            ["x", " ", " ", " ", "S", " ", " ", "w", " ", " ", " ", "Wi","x"],
-            ["x", " ", "b", " ", " ", " ", "R", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", "U", " ", " ", " ", " ", "w", " ", " ", "k", " " ,"x"],
-            ["x", " ", " ", " ", " ", " ", " ", "w", " ", "G", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "B", "I", "U", " ", "w", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)   
-     
-class Tutorial1(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "B", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "I", " ",  " ", " ", " ", " ", "f", " ", "x"],
-            ["x", "U", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ",  " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "b", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "F", "I", "Wi", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
+def _new_level_env(name, path=level_pack.DEFAULT_PACK):
+    cls = level_class(path, name)
+    return cls.__new__(cls)
 
-class Tutorial2(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "F", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "I", " ",  " ", " ", " ", " ", "f", " ", "x"],
-            ["x", "U", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ",  " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", "b", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", "B", "I", "Wi", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
 
-class Tutorial3(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "B", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "I", " ", " ", " ", " ", " ", "b", " ", "x"],
-            ["x", "U", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "f", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", "F", " ", "I", " ", "Wi"," ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
+def __getattr__(name):
+    # the levels of the default pack (e.g. my_envs.Env1D0), created on first access
+    if name.startswith("_") or name not in level_pack.index(level_pack.DEFAULT_PACK):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    cls = globals()[name] = level_class(level_pack.DEFAULT_PACK, name)
+    return cls
 
-class Tutorial4(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "B", "I", "U", " ", "F", "I", "Wi"," ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", "f", "x"],
-            ["x", "w", "w", "w", "w", "w", "w", "w", "w", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "W", "I", "S", " ", " ", " ", " ", "b", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
 
-class Tutorial5(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "B", "I", "U", " ", " ", "W", "I", "S", "x"],
-            ["x", " ", " ", " "," ", " ", " ", " ", " ", "x"],
-            ["x", "w", "w", "w", "w", "w", "w", "w", "w", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", "f", "x"],
-            ["x", "F", " ", " ", " ", " ", "b", " ", " ", "x"],
-            ["x", " ", " ", " ", "I", " ", " ", " ", " ", "x"],
-            ["x", "R", "I", "Wi"," ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-     
-class Tutorial6(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", "w", " ", " ", " ", "W", "x"],
-            ["x", "R", " ", "b", "w", " ", "r", " ", "I", "x"],
-            ["x", " ", " ", " ", "w", " ", " ", " ", "S", "x"],
-            ["x", "B", "I", "U", "w", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", "w", " ", " ", " ", "F", "x"],
-            ["x", " ", " ", " ", "w", " ", "f", " ", "I", "x"],
-            ["x", " ", " ", " ", "w", " ", " ", " ", "Wi","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs) 
-     
-class Tutorial7(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "B", "I", "U", " ", "R", "I", "Wi"," ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", "r", "x"],
-            ["x", "g", "g", "g", "g", "g", "g", "g", "g", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "G", "I", "Si"," ", " ", " ", " ", "b", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)  
-        
-class Tutorial8(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "G", "I", "Si"," ", "W", "I", "Wi"," ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", "w", "x"],
-            ["x", "g", "g", "g", "g", "g", "g", "g", "g", "x"],
-            ["x", "B", "I", " ", "Fl"," ", " ", " ", " ", "x"],
-            ["x", "I", " ", " ", " ", " ", " ", " ", "b", "x"],
-            ["x", "U", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", " ", " ", " ", " ", "x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)   
-     
-class Tutorial9(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", "W", "x"],
-            ["x", " ", " ", " ", "b", "w", " ", "k", "I", "x"],
-            ["x", "K", " ", " ", " ", "w", " ", " ", "S", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", "x"],
-            ["x", " ", " ", "I", " ", "w", " ", " ", "R", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", "r", "I", "x"],
-            ["x", "B", "I", "U", " ", "w", " ", " ", "Wi","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs)
-  
-class Tutorial10(GridArrEnv):
-    def __init__(self, **kwargs):
-        super().__init__(grid_arr=
-            [
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"],
-            ["x", "W", " ", " ", " ", "w", " ", " ", " ", "x"],
-            ["x", "I", " ", "F", "b", "w", " ", " ", " ", "x"],
-            ["x", "S", " ", " ", " ", "w", "B", "I", "U", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", "F", "I", "Wi", "x"],
-            ["x", " ", "I", " ", " ", "w", " ", " ", " ", "x"],
-            ["x", " ", " ", " ", " ", "w", " ", " ", " ","x"],
-            ["x", "x", "x", "x", "x", "x", "x", "x", "x", "x"]
-            ],
-            **kwargs) 
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(level_pack.index(level_pack.DEFAULT_PACK)))
@@ -1,7 +1,10 @@
-from gym.utils.play import display_arr
 import time
 
 def play(env, transpose=True, fps=30, zoom=None, callback=None, keys_to_action=None):
+    import pygame
+    from pygame import VIDEORESIZE
+    from gym.utils.play import display_arr
+
     if keys_to_action is None:
         keys_to_action = {
             (pygame.K_UP,): env.actions.up,
@@ -1,14 +1,38 @@
 import fnmatch
+from collections.abc import Mapping
+from itertools import repeat
+
+from . import level_pack
 
 
 registry = {}
+# level packs (path, id prefix) whose levels are added to the registry the first time it is looked up
+_packs = []
+
+
+def register_pack(path, prefix="env/"):
+    """
+    Register the levels of a level pack under the ids prefix + level name. The pack is indexed lazily and a level is
+    compiled only when it is made.
+    """
+    _packs.append((path, prefix))
+
+
+def _index_packs():
+    while _packs:
+        path, prefix = _packs.pop(0)
+        for name in level_pack.index(path):
+            registry.setdefault(prefix + name, level_pack.PackLevel(path, name))
 
 
 def make(id, call=True, *args, **kwargs):
+    _index_packs()
     if id not in registry:
         matches = match(id)
         if len(matches) > 0:
-            return {k: make(k, *args, **kwargs) for k in matches}
+            if not call:
+                return {k: registry[k] for k in matches}
+            return LazyEnvs(matches, args, kwargs)
 
         # no matches found, try suggesting closest match
         import difflib
@@ -25,6 +49,57 @@ def make(id, call=True, *args, **kwargs):
         return registry[id]
 
 
+def _make(env_fn, args, kwargs):
+    return env_fn(*args, **kwargs)
+
+
+class LazyEnvs(Mapping):
+    """
+    Environments of the ids matching a wildcard, returned by make. An environment is made when it is first accessed,
+    so listing the ids costs nothing.
+    """
+    def __init__(self, ids, args=(), kwargs=None):
+        # ids in order, as a dict for the lookups
+        self._ids = dict.fromkeys(ids)
+        self._args = args
+        self._kwargs = kwargs or {}
+        self._envs = {}
+
+    def __getitem__(self, id):
+        if id not in self._envs:
+            if id not in self._ids:
+                raise KeyError(id)
+            self._envs[id] = registry[id](*self._args, **self._kwargs)
+        return self._envs[id]
+
+    def __contains__(self, id):
+        return id in self._ids
+
+    def get(self, id, default=None):
+        return self[id] if id in self._ids else default
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def prebuild(self, max_workers=None, chunksize=10):
+        """
+        Make the environments not accessed yet in a process pool, for batch jobs. The registry entries, the arguments
+        and the environments must be picklable.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        ids = [id for id in self._ids if id not in self._envs]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            envs = executor.map(
+                _make, [registry[id] for id in ids], repeat(self._args), repeat(self._kwargs), chunksize=chunksize
+            )
+            self._envs.update(zip(ids, envs))
+        return self
+
+
 def register(id, obj=None):
     if obj is None:
         # decorator
@@ -38,11 +113,15 @@ def register(id, obj=None):
 
 def is_registered(id: str) -> bool:
     assert isinstance(id, str), f"Expected type str, got {type(id)}"
+    _index_packs()
     return id in registry
 
 
 def match(id: str) -> list[str]:
     assert isinstance(id, str), f"Expected type str, got {type(id)}"
+    _index_packs()
     res = [k for k in registry.keys() if fnmatch.fnmatch(k, id)]
     return res
 
+
+register_pack(level_pack.DEFAULT_PACK)
@@ -1,7 +1,6 @@
 import math
 
 import numpy as np
-import matplotlib.pyplot as plt
 
 
 def downsample(img, factor):
@@ -134,14 +133,16 @@ def highlight_img(img, color=(255, 255, 255), alpha=0.30):
 
 class Window:
     """
-    Window to draw a gridworld instance using Matplotlib
+    Window to draw a gridworld instance using Matplotlib (imported when the first window is created)
     """
 
     def __init__(self, title):
+        import matplotlib.pyplot as plt
+        self.plt = plt
         self.no_image_shown = True
 
         # Create the figure and axes
-        self.fig, self.ax = plt.subplots()
+        self.fig, self.ax = self.plt.subplots()
 
         # Show the env name in the window title
         self.fig.canvas.manager.set_window_title(title)
@@ -178,14 +179,14 @@ class Window:
         self.fig.canvas.flush_events()
 
         # Let matplotlib process UI events
-        plt.pause(0.001)
+        self.plt.pause(0.001)
 
     def set_caption(self, text):
         """
         Set/update the caption text below the image
         """
 
-        plt.xlabel(text)
+        self.plt.xlabel(text)
 
     def reg_key_handler(self, key_handler):
         """
@@ -202,17 +203,17 @@ class Window:
 
         # If not blocking, trigger interactive mode
         if not block:
-            plt.ion()
+            self.plt.ion()
 
         # Show the plot
         # In non-interative mode, this enters the matplotlib event loop
         # In interactive mode, this call does not block
-        plt.show()
+        self.plt.show()
 
     def close(self):
         """
         Close the window
         """
 
-        plt.close()
+        self.plt.close()
         self.closed = True
@@ -82,12 +82,13 @@ def extract_ruleset(grid, default_ruleset=None):
     if not isinstance(grid, Iterable):
         grid = grid.grid
 
-    # loop through all 'is' blocks
-    for k, e in enumerate(grid):
+    # loop through all 'is' blocks, using the positions indexed by the grid if available
+    if hasattr(grid, 'positions'):
+        is_blocks = [(i, j, grid.get(i, j)) for (i, j) in grid.positions('rule_is', top=True)]
+    else:
+        is_blocks = [(k % grid.width, k // grid.width, e) for k, e in enumerate(grid)]
+    for i, j, e in is_blocks:
         if e is not None and e.type == 'rule_is':
-            i, j = k % grid.width, k // grid.width
-            assert k == j * grid.width + i
-
             # check for horizontal rules
             if inside_grid(grid, (i-1, j)) and inside_grid(grid, (i+1, j)):
                 left_cell = grid.get(i-1, j)
@@ -0,0 +1,154 @@
+import multiprocessing as mp
+import os
+
+import numpy as np
+
+from .registration import make, is_registered
+
+
+def _worker(remote, parent_remote, env_fns, indices, shared, shape):
+    """
+    Run the environments env_fns (global indices `indices`) and write their observations into the shared buffer
+    """
+    parent_remote.close()
+    envs = [env_fn() for env_fn in env_fns]
+    # buffer[0]: observations, buffer[1]: last observations of the episodes that just ended
+    buffer = np.frombuffer(shared, dtype=np.uint8).reshape(shape)
+
+    def write(plane, k, env):
+        env.grid.encode(out=buffer[plane, k, :env.width, :env.height])
+
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                rewards, dones, infos = [], [], []
+                for k, env, action in zip(indices, envs, data):
+                    _, reward, done, info = env.step(action, observe=False)
+                    if done:
+                        write(1, k, env)
+                        env.reset()
+                    write(0, k, env)
+                    rewards.append(reward)
+                    dones.append(done)
+                    infos.append(info)
+                remote.send((rewards, dones, infos))
+            elif cmd == "reset":
+                for k, env in zip(indices, envs):
+                    env.reset()
+                    write(0, k, env)
+                remote.send(None)
+            elif cmd == "close":
+                break
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        remote.close()
+
+
+class SubprocVecEnv:
+    """
+    Run BabaIsYouEnv environments in worker processes, each worker stepping a contiguous batch of environments.
+
+    The observations are written by the workers into a shared memory buffer of shape (num_envs, width, height, 2)
+    instead of being sent back through the pipes. The environments can be different levels: width and height are the
+    largest ones and the cells outside a smaller level are 0. Finished environments are reset automatically, the last
+    observation of the episode being stored in the info dict (key 'terminal_observation'), like BabaIsYouVecEnv.
+    """
+
+    def __init__(self, env_fns, num_workers=None, start_method=None):
+        """
+        Args:
+            env_fns: list of registered env ids (e.g. 'env/Env1D0') or of functions creating an environment (picklable
+                with the start method, e.g. the level pack entries of the registry or the env classes of my_envs)
+            num_workers: number of worker processes, the number of cores by default
+            start_method: multiprocessing start method ('fork', 'forkserver' or 'spawn'), the default one if None
+        """
+        for env_fn in env_fns:
+            if isinstance(env_fn, str) and not is_registered(env_fn):
+                raise ValueError(f"`{env_fn}` is not the id of a registered environment (wildcards aren't accepted)")
+        env_fns = [make(env_fn, call=False) if isinstance(env_fn, str) else env_fn for env_fn in env_fns]
+        self.num_envs = len(env_fns)
+        num_workers = min(num_workers or os.cpu_count(), self.num_envs)
+        ctx = mp.get_context(start_method)
+
+        # size of the observation of each level, creating one environment per level
+        level_shapes = {}
+        for env_fn in env_fns:
+            if env_fn not in level_shapes:
+                env = env_fn()
+                level_shapes[env_fn] = (env.width, env.height, env.encoding_level)
+        self.level_shapes = [level_shapes[env_fn] for env_fn in env_fns]
+        self.width = max(shape[0] for shape in self.level_shapes)
+        self.height = max(shape[1] for shape in self.level_shapes)
+        depth = max(shape[2] for shape in self.level_shapes)
+
+        # shared memory (zeroed), allocated before starting the workers so that it is inherited by them
+        shape = (2, self.num_envs, self.width, self.height, depth)
+        shared = ctx.RawArray('B', int(np.prod(shape)))
+        self._buffer = np.frombuffer(shared, dtype=np.uint8).reshape(shape)
+
+        self._batches = np.array_split(np.arange(self.num_envs), num_workers)
+        self.remotes, self.processes = [], []
+        for indices in self._batches:
+            remote, work_remote = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker, args=(work_remote, remote, [env_fns[k] for k in indices], indices, shared, shape),
+                daemon=True,
+            )
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+        self.waiting = False
+        self.closed = False
+
+    def reset(self):
+        for remote in self.remotes:
+            remote.send(("reset", None))
+        for remote in self.remotes:
+            remote.recv()
+        return self._buffer[0].copy()
+
+    def step_async(self, actions):
+        actions = np.asarray(actions)
+        assert actions.shape == (self.num_envs,)
+        for remote, indices in zip(self.remotes, self._batches):
+            remote.send(("step", actions[indices].tolist()))
+        self.waiting = True
+
+    def step_wait(self):
+        """
+        Returns:
+            observations (num_envs, width, height, 2), rewards, dones, list of info dicts
+        """
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        rewards = np.array([r for result in results for r in result[0]], dtype=np.float64)
+        dones = np.array([d for result in results for d in result[1]], dtype=bool)
+        infos = [info for result in results for info in result[2]]
+        for k in np.flatnonzero(dones):
+            infos[k]['terminal_observation'] = self._buffer[1, k].copy()
+        return self._buffer[0].copy(), rewards, dones, infos
+
+    def step(self, actions):
+        """
+        Args:
+            actions: array of num_envs actions (BabaIsYouEnv.Actions)
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
@@ -1,6 +1,5 @@
 from itertools import product
 
-import cv2
 import numpy as np
 
 
@@ -12,6 +11,8 @@ def _get_font_scale(text):
     #     return 0.9
 
 def add_img_text(img, text):
+    # opencv is only needed to render the rule blocks
+    import cv2
     font = cv2.FONT_HERSHEY_SIMPLEX
     fontscale = _get_font_scale(text)
     thickness = 3
@@ -24,10 +25,11 @@ def add_img_text(img, text):
                 thickness=thickness)
 
 
-def grid_random_position(size, n_samples=1, margin=0, exclude_pos: list = None):
+def grid_random_position(size, n_samples=1, margin=0, exclude_pos: list = None, rng=None):
+    rng = np.random.default_rng(rng)
     positions = list(product(range(margin, size-margin), range(margin, size-margin)))
     indices = np.arange(len(positions))
-    pos_idx = np.random.choice(indices, n_samples, replace=False)
+    pos_idx = rng.choice(indices, n_samples, replace=False)
     sampled_pos = [positions[idx] for idx in pos_idx]
 
     if exclude_pos is not None:
@@ -38,7 +40,7 @@ def grid_random_position(size, n_samples=1, margin=0, exclude_pos: list = None):
                 is_valid = False
                 break
         if not is_valid:
-            sampled_pos = grid_random_position(size, n_samples, margin, exclude_pos)
+            sampled_pos = grid_random_position(size, n_samples, margin, exclude_pos, rng)
 
     return sampled_pos
 
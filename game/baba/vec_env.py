@@ -0,0 +1,455 @@
+import numpy as np
+
+from .grid import BabaIsYouGrid, BabaIsYouEnv
+from .rule import extract_ruleset
+from .world_object import (
+    WorldObj, Ruleset, OBJECT_TO_IDX, OBJECT_TYPE_IDX, PROPERTY_IDX, objects, name_mapping_inverted
+)
+
+
+# type code of each object type (rows of the ruleset tables)
+OBJECT_CODES = np.array([OBJECT_TO_IDX[o] for o in objects])
+IS_CODE = OBJECT_TO_IDX['is_word']
+EMPTY_CODE = OBJECT_TO_IDX['empty']
+
+# object type (resp. property) of the rule blocks by type code, -1 if the code isn't an object (resp. property) block
+WORD_OBJECT = np.full(256, -1, dtype=np.int8)
+WORD_PROPERTY = np.full(256, -1, dtype=np.int8)
+for _name, _code in OBJECT_TO_IDX.items():
+    if _name.endswith('_word') and _name != 'is_word':
+        _name = name_mapping_inverted.get(_name[:-len('_word')], _name[:-len('_word')])
+        if _name in OBJECT_TYPE_IDX:
+            WORD_OBJECT[_code] = OBJECT_TYPE_IDX[_name]
+        elif _name in PROPERTY_IDX:
+            WORD_PROPERTY[_code] = PROPERTY_IDX[_name]
+IS_WORD = (WORD_OBJECT >= 0) | (WORD_PROPERTY >= 0)
+IS_WORD[IS_CODE] = True
+
+# properties looked up by type code in the step kernel
+PUSH, OVERLAP, AGENT, MOVE, GOAL, DEFEAT, SINK, FLOAT = range(8)
+_TABLE_COLS = {PUSH: 'is_push', AGENT: 'is_agent', MOVE: 'is_move', GOAL: 'is_goal', DEFEAT: 'is_defeat',
+               SINK: 'is_sink', FLOAT: 'is_float'}
+
+# direction of the agent for each action (idle keeps the direction), see BabaIsYouEnv.step
+ACTION_TO_DIR = np.array([-1, 3, 0, 1, 2])
+DX = np.array([1, 0, -1, 0])
+DY = np.array([0, 1, 0, -1])
+
+
+class BabaIsYouVecEnv:
+    """
+    Run num_envs copies of an environment in lock step, following the same rules as BabaIsYouEnv.step.
+
+    The object stacks of all the environments are kept in numpy planes indexed by [env, i, j, z] (z counting up from
+    the bottom object, like in BabaIsYouGrid), and the ruleset of each environment is compiled into lookup tables
+    indexed by [env, type code]. A step moves the agents and the moving objects of all the environments at once: the
+    kernel only loops over the agents of a cell, the moving objects and the pushed blocks in front of them, each loop
+    iteration handling all the environments together. Finished environments are reset automatically, the last
+    observation of the episode being stored in the info dict (key 'terminal_observation').
+    """
+
+    def __init__(self, env: BabaIsYouEnv, num_envs: int):
+        """
+        Args:
+            env: environment to copy, all the environments start from its initial state (env.reset())
+            num_envs: number of environments
+        """
+        self.env = env
+        self.num_envs = num_envs
+        self.width = env.width
+        self.height = env.height
+        self.max_steps = env.max_steps
+
+        env.reset()
+        grid = env.grid
+        self._init_cells = grid.encode().copy()
+        self._default_ruleset = env.default_ruleset
+        self._init_types = grid.types.copy()
+        self._init_dirs = grid.dirs.copy()
+        self._init_heights = grid.heights.copy()
+
+        n = num_envs
+        self.types = np.repeat(self._init_types[None], n, axis=0)
+        self.dirs = np.repeat(self._init_dirs[None], n, axis=0)
+        self.heights = np.repeat(self._init_heights[None], n, axis=0).astype(np.int64)
+        self._moved = np.zeros(self.types.shape, dtype=bool)
+        # observation, updated cell by cell. Its two planes are also the type codes of the objects at the top of the
+        # cells and of the objects under them, EMPTY_CODE if none
+        self._cells = np.repeat(self._init_cells[None], n, axis=0)
+        # cells with agents that haven't moved yet, while moving the agents
+        self._agent_cells = None
+        self.step_count = np.zeros(n, dtype=np.int64)
+        # rules given by the default ruleset of the env, as a table and the first object that is 'you'
+        default = Ruleset(dict(self._default_ruleset))
+        self._default_table = default.table
+        default_agents = [OBJECT_TYPE_IDX[o] for o in default.get('is_agent', {}) if o in OBJECT_TYPE_IDX]
+        self._default_first_agent = default_agents[0] if default_agents else -1
+        self._props = np.zeros((8, n, 256), dtype=bool)
+        self._drown = np.zeros(n, dtype=bool)
+        self._extract_rules()
+
+        # scan order of the cells for the agents moving in each direction (see BabaIsYouEnv.step), and for the other
+        # moving objects (row by row)
+        i, j = np.meshgrid(np.arange(self.width), np.arange(self.height), indexing='ij')
+        ri, rj = self.width - 1 - i, self.height - 1 - j
+        self._agent_rank = np.stack([ri * self.height + j, i * self.height + rj, i * self.height + j, i * self.height + j])
+        self._move_rank = j * self.width + i
+
+    @property
+    def action_space(self):
+        return self.env.action_space
+
+    @property
+    def observation_space(self):
+        return self.env.observation_space
+
+    def reset(self):
+        self._reset_envs(np.arange(self.num_envs))
+        return self._obs()
+
+    def _reset_envs(self, envs):
+        depth = self._init_types.shape[2]
+        self.types[envs] = 0
+        self.dirs[envs] = 0
+        self.types[envs, :, :, :depth] = self._init_types
+        self.dirs[envs, :, :, :depth] = self._init_dirs
+        self.heights[envs] = self._init_heights
+        self._cells[envs] = self._init_cells
+        self.step_count[envs] = 0
+        self._extract_rules(envs)
+
+    def step(self, actions):
+        """
+        Args:
+            actions: array of num_envs actions (BabaIsYouEnv.Actions)
+        Returns:
+            observations (num_envs, width, height, 2), rewards, dones, list of info dicts
+        """
+        actions = np.asarray(actions)
+        assert actions.shape == (self.num_envs,)
+        self.step_count += 1
+        n = self.num_envs
+        win = np.zeros(n, dtype=bool)
+        lose = np.zeros(n, dtype=bool)
+
+        envs = np.flatnonzero(actions != 0)
+        if len(envs) > 0:
+            dirs = ACTION_TO_DIR[actions[envs]]
+            self._moved[envs] = False
+            self._move_agents(envs, dirs, win, lose)
+            self._move_objects(envs)
+            self._extract_rules(envs)
+            self._replace(envs)
+
+            # are we at a winning pos after all blocks have moved?
+            top, under = self._top_planes(envs)
+            is_agent = self._props[AGENT][envs[:, None, None], top]
+            is_goal = self._props[GOAL][envs[:, None, None], top] | self._props[GOAL][envs[:, None, None], under]
+            win[envs] |= (is_agent & is_goal).any(axis=(1, 2))
+
+        rewards = np.where(win, 1 - 0.9 * (self.step_count / self.max_steps), 0.)
+        dones = win | lose | (self.step_count >= self.max_steps)
+
+        obs = self._obs()
+        infos = [{} for _ in range(n)]
+        done_envs = np.flatnonzero(dones)
+        if len(done_envs) > 0:
+            for k in done_envs:
+                infos[k]['terminal_observation'] = obs[k].copy()
+            self._reset_envs(done_envs)
+            obs[done_envs] = self._obs(done_envs)
+        return obs, rewards, dones, infos
+
+    def get_grid(self, k):
+        """
+        Build the grid of the kth environment
+        """
+        grid = BabaIsYouGrid(self.width, self.height)
+        grid._ruleset = Ruleset({})
+        for i in range(self.width):
+            for j in range(self.height):
+                for z in range(self.heights[k, i, j]):
+                    v = WorldObj.decode(int(self.types[k, i, j, z]))
+                    v.dir = int(self.dirs[k, i, j, z])
+                    if hasattr(v, "set_ruleset"):
+                        v.set_ruleset(grid._ruleset)
+                    grid.set(i, j, v)
+        grid._ruleset.set(extract_ruleset(grid, default_ruleset=dict(self._default_ruleset)))
+        return grid
+
+    def _obs(self, envs=None):
+        """
+        Encode the two objects at the top of each cell, like BabaIsYouGrid.encode
+        """
+        if envs is None:
+            return self._cells.copy()
+        return self._cells[envs]
+
+    def _top_planes(self, envs):
+        """
+        Type codes of the objects at the top of the cells and of the objects under them
+        """
+        cells = self._cells[envs]
+        return cells[..., 0], cells[..., 1]
+
+    def _top(self, n, i, j, depth=1):
+        return self._cells[n, i, j, depth - 1]
+
+    def _grow(self):
+        """
+        Double the depth of the planes when a stack doesn't fit anymore
+        """
+        self.types = np.concatenate([self.types, np.zeros_like(self.types)], axis=3)
+        self.dirs = np.concatenate([self.dirs, np.zeros_like(self.dirs)], axis=3)
+        self._moved = np.concatenate([self._moved, np.zeros_like(self._moved)], axis=3)
+
+    def _extract_rules(self, envs=None):
+        """
+        Compile the rules formed by the blocks at the top of the cells into the property tables, see extract_ruleset
+        """
+        if envs is None:
+            envs = np.arange(self.num_envs)
+        top, _ = self._top_planes(envs)
+        obj, prop = WORD_OBJECT[top], WORD_PROPERTY[top]
+        is_block = top == IS_CODE
+        w = self.width
+
+        rules = []
+        # horizontal rules (left, is, right) and vertical rules (up, is, down), in the order of extract_ruleset
+        for k, (first, second, third) in enumerate([
+            (np.s_[:, :-2, :], np.s_[:, 1:-1, :], np.s_[:, 2:, :]),
+            (np.s_[:, :, :-2], np.s_[:, :, 1:-1], np.s_[:, :, 2:])
+        ]):
+            rule = is_block[second] & (obj[first] >= 0)
+            e, i, j = np.nonzero(rule & ((prop[third] >= 0) | (obj[third] >= 0)))
+            order = ((j + (k == 1)) * w + i + (k == 0)) * 2 + k
+            rules.append((e, order, obj[first][e, i, j], prop[third][e, i, j], obj[third][e, i, j]))
+        e, order, obj1, prop, obj2 = [np.concatenate(x) for x in zip(*rules)]
+        idx = np.lexsort((order, e))
+        e, obj1, prop, obj2 = e[idx], obj1[idx], prop[idx], obj2[idx]
+
+        table = np.repeat(self._default_table[None], len(envs), axis=0)
+        is_prop = prop >= 0
+        table[e[is_prop], obj1[is_prop], prop[is_prop]] = True
+        table[:, :, PROPERTY_IDX['is_stop']] |= table[:, :, PROPERTY_IDX['is_agent']]
+
+        # first object that is 'you', used to check if the agent drowns
+        first_agent = np.full(len(envs), self._default_first_agent)
+        if self._default_first_agent < 0:
+            is_agent = is_prop & (prop == PROPERTY_IDX['is_agent'])
+            agent_envs, first = np.unique(e[is_agent], return_index=True)
+            first_agent[agent_envs] = obj1[is_agent][first]
+        has_agent = first_agent >= 0
+        drown = has_agent & ~table[np.arange(len(envs)), np.maximum(first_agent, 0), PROPERTY_IDX['is_float']]
+
+        # replacement rules (obj1 is obj2) of each env, in order
+        is_replace = ~is_prop
+        self._replace_rules = (envs[e[is_replace]], OBJECT_CODES[obj1[is_replace]], OBJECT_CODES[obj2[is_replace]])
+
+        props = self._props[:, envs]
+        props[:] = False
+        props[PUSH][:, IS_WORD] = True
+        props[OVERLAP][:, EMPTY_CODE] = True
+        for col, name in _TABLE_COLS.items():
+            props[col][:, OBJECT_CODES] = table[:, :, PROPERTY_IDX[name]]
+        props[OVERLAP][:, OBJECT_CODES] = ~table[:, :, PROPERTY_IDX['is_stop']]
+        self._props[:, envs] = props
+        self._drown[envs] = drown
+
+    def _replace(self, envs):
+        """
+        Apply the replacement rules (obj1 is obj2) to the objects at the top of the cells, like BabaIsYouGrid.replace
+        """
+        rule_envs, codes1, codes2 = self._replace_rules
+        if len(rule_envs) == 0:
+            return
+        # rank of each rule in its env
+        start = np.searchsorted(rule_envs, rule_envs)
+        rank = np.arange(len(rule_envs)) - start
+        for r in range(rank.max() + 1):
+            sel = rank == r
+            k, i, j = np.nonzero(self._cells[rule_envs[sel], ..., 0] == codes1[sel][:, None, None])
+            n = rule_envs[sel][k]
+            self._pop(n, i, j)
+            self._put(n, i, j, codes2[sel][k], np.zeros(len(n), dtype=np.int64), np.zeros(len(n), dtype=bool))
+
+    def _pop(self, n, i, j, under=None):
+        """
+        Remove the object at the top of the cells, or all the objects under the top one where under is True
+        """
+        h = self.heights[n, i, j]
+        if under is None:
+            under = np.zeros(len(n), dtype=bool)
+        top = ~under
+        n1, i1, j1, h1 = n[top], i[top], j[top], h[top]
+        self.types[n1, i1, j1, h1 - 1] = 0
+        self.dirs[n1, i1, j1, h1 - 1] = 0
+        self._moved[n1, i1, j1, h1 - 1] = False
+        self.heights[n1, i1, j1] = h1 - 1
+        self._cells[n1, i1, j1, 0] = self._cells[n1, i1, j1, 1]
+        self._cells[n1, i1, j1, 1] = np.where(h1 >= 3, self.types[n1, i1, j1, np.maximum(h1 - 3, 0)], EMPTY_CODE)
+
+        n2, i2, j2, h2 = n[under], i[under], j[under], h[under]
+        if len(n2) > 0:
+            for plane in (self.types, self.dirs, self._moved):
+                plane[n2, i2, j2, 0] = plane[n2, i2, j2, h2 - 1]
+                plane[n2, i2, j2, 1:] = 0
+            self.heights[n2, i2, j2] = 1
+            self._cells[n2, i2, j2, 1] = EMPTY_CODE
+
+    def _put(self, n, i, j, codes, dirs, moved):
+        """
+        Put objects at the top of the cells, unless the object at the top is sink and the new object doesn't float
+        """
+        top = self._top(n, i, j)
+        keep = ~(self._props[SINK][n, top] & ~self._props[FLOAT][n, codes])
+        n, i, j, codes, moved = n[keep], i[keep], j[keep], codes[keep], moved[keep]
+        z = self.heights[n, i, j]
+        while len(z) > 0 and z.max() >= self.types.shape[3]:
+            self._grow()
+        self.types[n, i, j, z] = codes
+        self.dirs[n, i, j, z] = dirs[keep]
+        self._moved[n, i, j, z] = moved
+        self.heights[n, i, j] = z + 1
+        self._cells[n, i, j, 1] = self._cells[n, i, j, 0]
+        self._cells[n, i, j, 0] = codes
+        if self._agent_cells is not None:
+            self._agent_cells[n, i, j] |= self._props[AGENT][n, codes] & ~moved
+
+    def _relocate(self, n, i, j, dirs, under):
+        """
+        Move the object at the top of the cells (or the one under it) to the next cell in the given directions and
+        turn it in that direction, like BabaIsYouEnv.change_obj_pos
+        """
+        z = self.heights[n, i, j] - 1 - under.astype(np.int64)
+        codes = self.types[n, i, j, z]
+        moved = self._moved[n, i, j, z]
+        self._put(n, i + DX[dirs], j + DY[dirs], codes, dirs, moved)
+        self._pop(n, i, j, under)
+
+    def _inside(self, i, j):
+        return (i >= 0) & (i < self.width) & (j >= 0) & (j < self.height)
+
+    def _can_enter(self, n, i, j):
+        inside = self._inside(i, j)
+        i, j = np.where(inside, i, 0), np.where(inside, j, 0)
+        return inside & self._props[OVERLAP][n, self._top(n, i, j)]
+
+    def _move(self, n, i, j, dirs, under):
+        """
+        Move the object at i, j (or the one under the top if under) of each env n one cell in its direction, pushing the
+        blocks in front of it, like BabaIsYouEnv.move. At most one object per env.
+        Returns:
+            new positions, is_win, is_lose, whether the object moved
+        """
+        dx, dy = DX[dirs], DY[dirs]
+        # length of the chain of pushable objects in front of each object
+        chain = np.zeros(len(n), dtype=np.int64)
+        pushing = np.ones(len(n), dtype=bool)
+        k = 1
+        while pushing.any():
+            ci, cj = i + k * dx, j + k * dy
+            inside = self._inside(ci, cj)
+            ci, cj = np.where(inside, ci, 0), np.where(inside, cj, 0)
+            pushing &= inside & self._props[PUSH][n, self._top(n, ci, cj)]
+            chain[pushing] = k
+            k += 1
+
+        # push the chains, starting from the last block
+        for k in range(chain.max(initial=0), 0, -1):
+            sel = chain >= k
+            m, ci, cj, d = n[sel], i[sel] + k * dx[sel], j[sel] + k * dy[sel], dirs[sel]
+            can = self._can_enter(m, ci + DX[d], cj + DY[d])
+            self._relocate(m[can], ci[can], cj[can], d[can], np.zeros(can.sum(), dtype=bool))
+
+        fi, fj = i + dx, j + dy
+        can = self._can_enter(n, fi, fj)
+        ni, nj = np.where(can, fi, i), np.where(can, fj, j)
+
+        # check if win or lose before moving the object
+        top, below = self._top(n, ni, nj), self._top(n, ni, nj, depth=2)
+        is_win = self._props[GOAL][n, top] | self._props[GOAL][n, below]
+        is_lose = self._props[DEFEAT][n, top] | (self._props[SINK][n, top] & self._drown[n])
+
+        moved = can & (self.heights[n, i, j] >= 1 + under)
+        self._relocate(n[moved], i[moved], j[moved], dirs[moved], under[moved])
+        return ni, nj, is_win, is_lose, moved
+
+    def _move_agents(self, envs, dirs, win, lose):
+        """
+        Move the agents, going through the cells in the order of BabaIsYouEnv.step
+        """
+        heights = self.heights[envs]
+        depth = np.arange(heights.max(initial=0))
+        agent = self._props[AGENT][envs[:, None, None, None], self.types[envs][..., :len(depth)]]
+        self._agent_cells = np.zeros(self.heights.shape, dtype=bool)
+        self._agent_cells[envs] = (agent & (depth < heights[..., None])).any(axis=3)
+
+        last = np.full(len(envs), -1)
+        ranks = self._agent_rank[dirs]
+        rank_max = np.iinfo(np.int64).max
+        while len(envs) > 0:
+            # next cell with an agent that hasn't moved
+            rank = np.where(self._agent_cells[envs] & (ranks > last[:, None, None]), ranks, rank_max)
+            cell = rank.reshape(len(envs), -1).argmin(axis=1)
+            last = rank.reshape(len(envs), -1)[np.arange(len(envs)), cell]
+            found = last < rank_max
+            envs, dirs, ranks, cell, last = envs[found], dirs[found], ranks[found], cell[found], last[found]
+            i, j = cell // self.height, cell % self.height
+            self._agent_cells[envs, i, j] = False
+            self._move_cell_agents(envs, i, j, dirs, win, lose)
+        self._agent_cells = None
+
+    def _move_cell_agents(self, n, i, j, dirs, win, lose):
+        """
+        Move the agents of a cell (one per env), in the order of the objects in the cell when the cell is reached
+        """
+        depth = np.arange(self.types.shape[3])
+        types = self.types[n, i, j]
+        moved = self._moved[n, i, j]
+        heights = self.heights[n, i, j]
+        # current layer of the objects that were in the cell, -1 if they left
+        layer = np.where(depth < heights[:, None], depth, -1)
+        for z in range(heights.max(initial=0)):
+            sel = np.flatnonzero((z < heights) & self._props[AGENT][n, types[:, z]] & ~moved[:, z])
+            if len(sel) == 0:
+                continue
+            m, ci, cj, d = n[sel], i[sel], j[sel], dirs[sel]
+            z_cur = layer[sel, z]
+            inside = z_cur >= 0
+            self.dirs[m[inside], ci[inside], cj[inside], z_cur[inside]] = d[inside]
+            self._moved[m[inside], ci[inside], cj[inside], z_cur[inside]] = True
+
+            h = self.heights[m, ci, cj][:, None]
+            under = z < heights[sel] - 1
+            _, _, is_win, is_lose, has_moved = self._move(m, ci, cj, d, under)
+            win[m], lose[m] = is_win, is_lose
+
+            # objects that left the cell: the top one, or all the ones under it (see BabaIsYouGrid.set_under)
+            top = (has_moved & ~under)[:, None]
+            below = (has_moved & under)[:, None]
+            cell_layer = layer[sel]
+            cell_layer = np.where(top & (cell_layer == h - 1), -1, cell_layer)
+            cell_layer = np.where(below & (cell_layer == h - 1), 0, np.where(below & (cell_layer < h - 1), -1, cell_layer))
+            layer[sel] = cell_layer
+
+    def _move_objects(self, envs):
+        """
+        Move the objects that are 'move' at the top of the cells, going through the cells row by row
+        """
+        envs = envs[self._props[MOVE][envs].any(axis=1)]
+        last = np.full(len(envs), -1)
+        rank_max = np.iinfo(np.int64).max
+        while len(envs) > 0:
+            z = np.maximum(self.heights[envs] - 1, 0)[..., None]
+            moved = np.take_along_axis(self._moved[envs], z, axis=3)[..., 0]
+            mover = self._props[MOVE][envs[:, None, None], self._cells[envs, ..., 0]] & ~moved
+            rank = np.where(mover & (self._move_rank > last[:, None, None]), self._move_rank, rank_max)
+            cell = rank.reshape(len(envs), -1).argmin(axis=1)
+            last = rank.reshape(len(envs), -1)[np.arange(len(envs)), cell]
+            found = last < rank_max
+            envs, cell, last = envs[found], cell[found], last[found]
+            i, j = cell // self.height, cell % self.height
+            h = self.heights[envs, i, j] - 1
+            self._moved[envs, i, j, h] = True
+            self._move(envs, i, j, self.dirs[envs, i, j, h].astype(np.int64), np.zeros(len(envs), dtype=bool))
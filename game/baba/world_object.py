@@ -33,6 +33,10 @@ objects = [
     "wall"
 ]
 
+# rows and columns of the compiled ruleset tables
+OBJECT_TYPE_IDX = {o: k for k, o in enumerate(objects)}
+PROPERTY_IDX = {p: k for k, p in enumerate(properties)}
+
 name_mapping = {
     'wall': 'wall',
     'goop': 'goop',
@@ -144,7 +148,10 @@ def make_obj(name: str, color: str = None):
 class WorldObj:
     """
     Base class for grid world objects
+
+    The objects use __slots__ to keep the grid states small, positions are stored as tuples of ints.
     """
+    __slots__ = ('type', 'color', 'contains', 'init_pos', 'cur_pos', 'dir')
 
     def __init__(self, type, color):
         #assert type in OBJECT_TO_IDX, type
@@ -158,6 +165,9 @@ class WorldObj:
         # Current position of the object
         self.cur_pos = None
 
+        # direction in which the object is facing
+        self.dir = 0  # order: right, down, left, up
+
     def is_agent(self):
         return False
 
@@ -187,6 +197,18 @@ class WorldObj:
     def is_sink(self):
         return False
 
+    def clone(self):
+        """Shallow copy of the object"""
+        cls = self.__class__
+        obj = cls.__new__(cls)
+        for attr in _slot_names(cls):
+            try:
+                setattr(obj, attr, getattr(self, attr))
+            except AttributeError:
+                # slot not set
+                pass
+        return obj
+
     def toggle(self, env, pos):
         """Method to trigger/toggle an action this object performs"""
         return False
@@ -241,6 +263,8 @@ class WorldObj:
 
 
 class Wall(WorldObj):
+    __slots__ = ()
+
     def __init__(self, color="grey"):
         super().__init__("wall", color)
 
@@ -251,6 +275,8 @@ class Wall(WorldObj):
         fill_coords(img, point_in_rect(0, 1, 0, 1), COLORS[self.color])
 
 class Border(WorldObj):
+    __slots__ = ()
+
     def __init__(self, color="red"):
         super().__init__("border", color)
 
@@ -261,22 +287,49 @@ class Border(WorldObj):
         fill_coords(img, point_in_rect(0, 1, 0, 1), COLORS["red"])
 
 
+def _slot_names(cls):
+    """
+    Return the names of the slots of cls and its base classes
+    """
+    if cls not in _SLOT_NAMES:
+        _SLOT_NAMES[cls] = tuple(attr for c in cls.__mro__ for attr in getattr(c, '__slots__', ()))
+    return _SLOT_NAMES[cls]
+
+
+_SLOT_NAMES = {}
+
+
+# Rendered text of the rule blocks by (name, margin), rendered the first time a block is drawn
+GLYPH_CACHE = {}
+
+
 class RuleBlock(WorldObj):
     """
     By default, rule blocks can be pushed by the agent.
     """
+    __slots__ = ('_is_push', 'name', 'id')
+
+    margin = 10
+
     def __init__(self, name, type, color, is_push=True):
         #type = name_mapping[name] + "_word"
         
         super().__init__(type, color)
         self._is_push = is_push
         self.name = name = name_mapping.get(name, name)
-        self.margin = 10
-        img = np.zeros((96-2*self.margin, 96-2*self.margin, 3), np.uint8)
-        add_img_text(img, name)
-        self.img = img
         self.id = None
 
+    @property
+    def img(self):
+        """Rendered text of the block, shared by all the blocks with the same name"""
+        key = (self.name, self.margin)
+        if key not in GLYPH_CACHE:
+            img = np.zeros((96-2*self.margin, 96-2*self.margin, 3), np.uint8)
+            add_img_text(img, self.name)
+            img.flags.writeable = False
+            GLYPH_CACHE[key] = img
+        return GLYPH_CACHE[key]
+
     def can_overlap(self):
         return False
 
@@ -295,6 +348,8 @@ class RuleBlock(WorldObj):
 
 
 class RuleObject(RuleBlock):
+    __slots__ = ('object',)
+
     def __init__(self, obj, is_push=True):
         obj = name_mapping_inverted[obj] if obj not in objects else obj
         # TODO: red push is win (push is a rule_obj but not in objects)
@@ -305,6 +360,8 @@ class RuleObject(RuleBlock):
 
 
 class RuleProperty(RuleBlock):
+    __slots__ = ('property',)
+
     def __init__(self, property, is_push=True):
         property = name_mapping_inverted[property] if property not in properties else property
         assert property in properties, "{} not in {}".format(property, properties)
@@ -314,11 +371,15 @@ class RuleProperty(RuleBlock):
 
 
 class RuleIs(RuleBlock):
+    __slots__ = ()
+
     def __init__(self, is_push=True):
         super().__init__('is', 'rule_is', 'purple', is_push=is_push)
 
 
 class RuleColor(RuleBlock):
+    __slots__ = ('obj_color',)
+
     def __init__(self, obj_color, is_push=True):
 
         super().__init__(obj_color, 'rule_color', 'purple', is_push=is_push)
@@ -329,18 +390,47 @@ class Ruleset:
     """
     Each object in the env has a reference to the ruleset object, which is automatically updated (would have to manually
     update it if were using a dict instead).
+
+    The ruleset is compiled into a dense boolean table (object type x property) every time the rules change, so that the
+    property methods of FlexibleWorldObj are a simple lookup.
     """
     def __init__(self, ruleset_dict):
         self.ruleset_dict = ruleset_dict
+        self.compile()
 
     def set(self, ruleset_dict):
         self.ruleset_dict = ruleset_dict
+        self.compile()
+
+    def compile(self):
+        table = np.zeros((len(objects), len(properties)), dtype=bool)
+        for k, prop in enumerate(properties):
+            for typ, value in self.ruleset_dict.get(prop, {}).items():
+                if value and typ in OBJECT_TYPE_IDX:
+                    table[OBJECT_TYPE_IDX[typ], k] = True
+        # objects that are 'you' are also 'stop'
+        table[:, PROPERTY_IDX['is_stop']] |= table[:, PROPERTY_IDX['is_agent']]
+        self.table = table
+        # same table as nested lists, faster to index with python ints
+        self.rows = table.tolist()
+        # object types having each property
+        self.types = {prop: [objects[k] for k in np.flatnonzero(table[:, p])] for p, prop in enumerate(properties)}
+        # incremented every time the rules change
+        self.version = getattr(self, 'version', 0) + 1
+
+    def copy(self):
+        """Return a new ruleset sharing the rules and the compiled table with this one"""
+        ruleset = self.__class__.__new__(self.__class__)
+        ruleset.__dict__.update(self.__dict__)
+        return ruleset
 
     def __getitem__(self, item):
         return self.ruleset_dict[item]
 
     def __setitem__(self, key, value):
-        self.ruleset_dict[key] = value
+        # new dict, the current one can be shared with copies of the ruleset
+        self.ruleset_dict = {**self.ruleset_dict, key: value}
+        self.compile()
 
     def __str__(self):
         return f'Ruleset dict: {self.ruleset_dict}'
@@ -358,38 +448,30 @@ def make_prop_fn(prop: str):
     """
     Make a method that retrieves the property of an instance of FlexibleWorldObj in the ruleset
     """
-    def _get_color_set(ruleset, typ, prop):
-        return ruleset[prop].get(typ + "_color", [])
+    k = PROPERTY_IDX[prop]
 
     def get_prop(self: FlexibleWorldObj):
-        # retrieve the type and color specific to the instance 'self' (the function is the same for all instances)
-        typ = self.type
-        ruleset = self.get_ruleset()
-
-        if prop == 'is_stop':
-            if ruleset['is_agent'].get(typ, False):
-                ruleset['is_stop'][typ] = True
-
-        if ruleset[prop].get(typ, False):  # object type set to True
-            return True
-        return False
+        # retrieve the type specific to the instance 'self' (the function is the same for all instances)
+        return self._ruleset.rows[self.type_idx][k]
 
     return get_prop
 
 
 class FlexibleWorldObj(WorldObj):
+    __slots__ = ('name', 'type_idx', 'default_type', 'has_moved', '_ruleset')
+
     def __init__(self, type, color):
         assert type in objects, "{} not in {}".format(type, objects)
         super().__init__(type, color)
         self.name = name_mapping[type]  # pretty name
-        # direction in which the object is facing
-        self.dir = 0  # order: right, down, left, up
+        # row of the object in the compiled ruleset tables
+        self.type_idx = OBJECT_TYPE_IDX[type]
         self.default_type = self.type
-        for prop in properties:
-            # create a method for each property and bind it to the class (same for all the instances of that class)
-            setattr(self.__class__, prop, make_prop_fn(prop))
+        self.has_moved = False
 
     def set_ruleset(self, ruleset):
+        if not isinstance(ruleset, Ruleset):
+            ruleset = Ruleset(ruleset)
         self._ruleset = ruleset
 
     def get_ruleset(self):
@@ -401,7 +483,14 @@ class FlexibleWorldObj(WorldObj):
         return not (self.is_stop() or self.is_agent())
 
 
+# create a method for each property, defined once for FlexibleWorldObj and shared by all its subclasses and instances
+for prop in properties:
+    setattr(FlexibleWorldObj, prop, make_prop_fn(prop))
+
+
 class Wall(FlexibleWorldObj):
+    __slots__ = ()
+
     def __init__(self, color="grey"):
         super().__init__("wall", color)
 
@@ -410,6 +499,8 @@ class Wall(FlexibleWorldObj):
 
 
 class Rock(FlexibleWorldObj):
+    __slots__ = ()
+
     def __init__(self, color="green"):
         super().__init__("rock", color)
 
@@ -417,6 +508,8 @@ class Rock(FlexibleWorldObj):
         fill_coords(img, point_in_circle(0.5, 0.5, 0.31), COLORS[self.color])
 
 class Flag(FlexibleWorldObj):
+    __slots__ = ()
+
     def __init__(self, color="blue"):
         super().__init__("flag", color)
 
@@ -424,6 +517,8 @@ class Flag(FlexibleWorldObj):
         fill_coords(img, point_in_circle(0.5, 0.5, 0.31), COLORS[self.color])
         
 class Keke(FlexibleWorldObj):
+    __slots__ = ()
+
     def __init__(self, color="yellow"):
         super().__init__("keke", color)
 
@@ -431,6 +526,8 @@ class Keke(FlexibleWorldObj):
         fill_coords(img, point_in_circle(0.5, 0.5, 0.31), COLORS[self.color])
         
 class Goop(FlexibleWorldObj):
+    __slots__ = ()
+
     def __init__(self, color="blue"):
         super().__init__("goop", color)
 
@@ -444,6 +541,8 @@ class Goop(FlexibleWorldObj):
         fill_coords(img, point_in_rect(0.05, 0.95, 0.85, 0.87), np.array([7, 3, 252]))
 
 class Baba(FlexibleWorldObj):
+    __slots__ = ()
+
     def __init__(self, color="white"):
         super().__init__("baba", color)
 
@@ -459,6 +558,8 @@ class Baba(FlexibleWorldObj):
         fill_coords(img, tri_fn, (255, 255, 255))
 
 class Keke(FlexibleWorldObj):
+    __slots__ = ()
+
     def __init__(self, color="red"):
         super().__init__("keke", color)
 
@@ -1,15 +1,11 @@
-import pygame
-from gym.utils.play import display_arr
-from pygame import VIDEORESIZE
-import pandas as pd
 import numpy as np
 import argparse
-from game.baba import make
-from game.baba.my_envs import *
+from game.baba.registration import make
 from game.baba.grid import BabaIsYouGrid
-from game.baba.registration import register
 
 def play(env, transpose=True, fps=30, zoom=None, callback=None, keys_to_action=None):
+    import pygame
+
     if keys_to_action is None:
         keys_to_action = {
             (pygame.K_UP,): env.actions.up,
@@ -60,6 +56,10 @@ def play(env, transpose=True, fps=30, zoom=None, callback=None, keys_to_action=N
         break
     
 def play_and_render(env, transpose=True, fps=30, zoom=None, callback=None, keys_to_action=None):
+    import pygame
+    from pygame import VIDEORESIZE
+    from gym.utils.play import display_arr
+
     if keys_to_action is None:
         keys_to_action = {
             (pygame.K_UP,): env.actions.up,
@@ -135,13 +135,8 @@ def play_and_render(env, transpose=True, fps=30, zoom=None, callback=None, keys_
     pygame.quit()
 
 
-def register_envs():
-    for env in [Tutorial1, Tutorial2, Tutorial3, Tutorial4, Tutorial5, Tutorial6, Tutorial7, Tutorial8, Tutorial9, Tutorial10, Env1D0, Env1D1, Env2D0, Env2D1, Env3D0, Env3D1, Env4D0, Env4D1, Env5D0, Env5D1, Env6D0, Env6D1, Env7D0, Env7D1, Env8D0, Env8D1, Env9D0, Env9D1, Env10D0, Env10D1, Env11D0, Env11D1, Env12D0, Env12D1, Env13D0, Env13D1, Env14D0, Env14D1, Env15D0, Env15D1]:
-        register('env/' +  env.__name__, env)
-
-
 def step_env(game_type, env, action):
-    obs, rew, env_done, info = env.step(action)
+    obs, rew, env_done, info = env.step(action, observe=False)
     if rew > 0:
         rew = 1
     try:
@@ -152,7 +147,7 @@ def step_env(game_type, env, action):
     
     
 def step_tutorial_env(game_type, env, action):
-    obs, rew, env_done, info = env.step(action)
+    obs, rew, env_done, info = env.step(action, observe=False)
     if rew > 0:
         rew = 1
     try:
@@ -163,9 +158,5 @@ def step_tutorial_env(game_type, env, action):
     
 
 def init_env(game_type):
-    register_envs()
     env = make(f"env/{game_type}")
     return env
-
-if __name__ == "__main__":
-    register_envs()
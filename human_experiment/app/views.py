@@ -33,7 +33,7 @@ def init_game(data):
     game_type = data.get("game_type")
     env = init_env(game_type)
     r = get_redis_conn()
-    r.set(f"grid:{request.sid}", pickle.dumps({"env": env, "game_type": game_type}))
+    r.set(f"grid:{request.sid}", pickle.dumps({"state": env.get_state(), "game_type": game_type}))
     emit("game_update", {'grid':env.grid.encode().tolist()})
     
 @socketio.on("player_action")
@@ -46,12 +46,13 @@ def handle_player_action(data):
        emit("error", {"message": "Game not initialized."})
        return
     game_data = pickle.loads(raw)
-    env = game_data["env"]
+    env = init_env(game_data["game_type"])
+    env.set_state(game_data["state"])
     if data.get("is_tutorial"):
         _, won, agent_pos = step_tutorial_env(game_type, env, action)
     else:
         _, won, agent_pos = step_env(game_type, env, action)
-    game_data["env"] = env
+    game_data["state"] = env.get_state()
     r.set(f"grid:{request.sid}", pickle.dumps(game_data))
     emit('game_update', {'grid': env.grid.encode().tolist(), 'won': won, 'agent_pos':agent_pos})
 
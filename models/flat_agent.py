@@ -3,11 +3,13 @@ import time
 import gc
 import os
 from game.baba.rule import extract_ruleset, extract_rule
-from concurrent.futures import ProcessPoolExecutor, as_completed
 from models.utils import *
 
 class FlatAgent:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # np.random.Generator or seed used for all the random choices of the agent. The tasks run in the process pool
+        # get their own seed, drawn in submission order, so that the results don't depend on the workers
+        self.rng = np.random.default_rng(rng)
         self.reset()
         
     def reset(self):
@@ -52,10 +54,12 @@ class FlatAgent:
             elif dist2 < dist1:
                 return moves2
             else:
-                return [moves1, moves2][np.random.choice(2)]
+                return [moves1, moves2][self.rng.integers(2)]
 
         
     def BFS(self, init_state, img_path = "models/debug_imgs/"):
+        from concurrent.futures import ProcessPoolExecutor
+
         add_rule_block_ids(init_state)
         
         n_cpu=os.cpu_count()
@@ -96,7 +100,8 @@ class FlatAgent:
             with ProcessPoolExecutor(max_workers=n_cpu) as executor:
                 for i in range(0, len(args), batch_size):
                     chunk = args[i:i+batch_size]
-                    for (maybe_sol, non_sol, nc_maybe_sol, nc_non_sol) in executor.map(get_possible_moves_wrapper, chunk, chunksize=10):
+                    seeds = self.task_seeds(len(chunk))
+                    for (maybe_sol, non_sol, nc_maybe_sol, nc_non_sol) in executor.map(get_possible_moves_wrapper, chunk, seeds, chunksize=10):
                         n_calls[depth+1] += nc_maybe_sol
                         n_calls_non_sol += nc_non_sol
                         maybe_solution_poss_moves += maybe_sol
@@ -109,7 +114,8 @@ class FlatAgent:
             # first eval maybe solvable ones
             with ProcessPoolExecutor(max_workers=n_cpu) as executor:
                 start = time.time()
-                for (new_state, move, nc, state_hash) in executor.map(attempt_move_wrapper, maybe_solution_poss_moves, chunksize=10): # why do we think it's a soluton?
+                seeds = self.task_seeds(len(maybe_solution_poss_moves))
+                for (new_state, move, nc, state_hash) in executor.map(attempt_move_wrapper, maybe_solution_poss_moves, seeds, chunksize=10): # why do we think it's a soluton?
                     n_calls[depth+1] += nc
                     nodes_visited +=1
                     if new_state:  
@@ -131,9 +137,9 @@ class FlatAgent:
                 chunk = non_solution_poss_moves[i:i+batch_size]
     
                 with ProcessPoolExecutor(max_workers=n_cpu) as executor:
-                    futures = [executor.submit(attempt_move_wrapper, args) for args in chunk]
-                    for future in as_completed(futures):
-                        new_state, move, nc, state_hash = future.result()
+                    # results processed in submission order (not as completed) for reproducibility
+                    seeds = self.task_seeds(len(chunk))
+                    for (new_state, move, nc, state_hash) in executor.map(attempt_move_wrapper, chunk, seeds, chunksize=10):
                         n_calls[depth+1] += nc
                         nodes_visited +=1
                         n_processed+=1
@@ -149,6 +155,9 @@ class FlatAgent:
         return solution_states, moves_by_state, nodes_visited, n_calls
         
         
+    def task_seeds(self, n):
+        return self.rng.integers(2**63, size=n)
+
     def get_high_level_actions(self, grid):
     
         solution_states, moves_by_state, n_actions_considered, n_calls = self.BFS(grid)
@@ -157,7 +166,7 @@ class FlatAgent:
             max_depth = max(n_calls.keys())
             self.n_calls = sum(n_calls.values()) - n_calls[max_depth] + n_calls[max_depth]/len(solution_states)
             solution_state_moves = [moves_by_state[hash_grid(sol_state)] for sol_state in solution_states]
-            moves = solution_state_moves[np.random.choice(len(solution_state_moves))]  
+            moves = solution_state_moves[self.rng.integers(len(solution_state_moves))]  
         else:
             self.n_calls += sum(n_calls.values())
             moves = None
@@ -186,7 +195,7 @@ class FlatAgent:
                     print("RESETTING") if self.debug else None
                     return  {'action':"reset", 'search_n_nodes':self.search_n_nodes, 'search_depth':self.search_depth, 'n_calls':self.n_calls}
                     
-            path, self.low_level_actions = get_low_level_actions(env.grid, self.high_level_actions[0])
+            path, self.low_level_actions = get_low_level_actions(env.grid, self.high_level_actions[0], self.rng)
             self.high_level_actions = self.high_level_actions[1:]
 
         action = self.low_level_actions[0]
@@ -195,7 +204,7 @@ class FlatAgent:
   
   
 
-def get_block_push_moves(state):
+def get_block_push_moves(state, rng=None):
     """
     Get all possible moves that involve pushing a rule block to a new locations
     Valid new locations include all locations adjacent to other rule blocks
@@ -208,7 +217,7 @@ def get_block_push_moves(state):
             sim_move = (sim_move[0], sim_move[1], sim_move[2], sim_move[3][0])
         if isinstance(sim_move[0], list):
             sim_move = (sim_move[0][0], sim_move[1], sim_move[2], sim_move[3])
-        sim_state = simulate_move(state.copy(), sim_move)
+        sim_state = simulate_move(state.copy(), sim_move, rng)
         return agent_is_goal(sim_state)
     
     nc_maybe_sol = 0
@@ -221,7 +230,7 @@ def get_block_push_moves(state):
         if e is not None and "rule" in e.type:
             # check if it's reachable
             found_maybe_solvable = False
-            reachable = is_reachable(state, e)
+            reachable = is_reachable(state, e, rng)
             
             edge_x = on_x_border(e, state)
             edge_y = on_y_border(e, state)
@@ -275,9 +284,9 @@ def get_goto_goal_moves(state):
         move_list.append(move)
     return move_list
 
-def get_possible_moves_wrapper(args):
+def get_possible_moves_wrapper(args, seed=None):
     state, state_hash = args
-    m1, nc_maybe_sol, nc_non_sol = get_block_push_moves(state)
+    m1, nc_maybe_sol, nc_non_sol = get_block_push_moves(state, np.random.default_rng(seed))
     m2 = get_goto_goal_moves(state)
     possible_moves = m1
     for m in m2:
@@ -294,25 +303,31 @@ def get_possible_moves_wrapper(args):
     return maybe_solution_poss_moves, non_solution_poss_moves, nc_maybe_sol, nc_non_sol
  
  
-def attempt_goto_goal(state):
+def attempt_goto_goal(state, rng=None):
     goal_pos_list = get_goal_pos(state, extract_ruleset(state))
     ruleset = extract_ruleset(state)
     agent_pos = get_agent_pos(state, ruleset)
     if agent_pos is None or len(goal_pos_list)==0:
         return None, 0
-    path, _ = run_astar(agent_pos, goal_pos_list, state)
+    path, _ = run_astar(agent_pos, goal_pos_list, state, rng=rng)
     if path is None:
         return None, 1
     else:
         return (path[0][0], path[-1][0]), 1
 
-def move_generator(poss_moves, n_cpu):
+def move_generator(poss_moves, n_cpu, seeds):
+    """
+    seeds: one seed per move for the random choices of the task (see FlatAgent.task_seeds)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
     with ProcessPoolExecutor(max_workers=n_cpu) as executor:
-        for (new_state, move, nc, state_hash) in executor.map(attempt_move_wrapper, poss_moves, chunksize=10):
+        for (new_state, move, nc, state_hash) in executor.map(attempt_move_wrapper, poss_moves, seeds, chunksize=10):
             yield new_state, move, nc, state_hash
 
-def attempt_move_wrapper(args):
+def attempt_move_wrapper(args, seed=None):
     move, state, state_hash = args
+    rng = np.random.default_rng(seed)
     if get_agent_pos(state, extract_ruleset(state)) is None:
         return None, None, 0, state_hash
 
@@ -321,11 +336,11 @@ def attempt_move_wrapper(args):
         r = state.get(*push_from_pos)
         if isinstance(push_to_pos, list): # pushing block to one of any positions away from other rule blocks
             scores = [1 / (n_adjacent_stop(state, p) + 1) for p in push_to_pos]
-            path, _ = run_astar(get_agent_pos(state), push_to_pos, state, push_from_pos, scores)
+            path, _ = run_astar(get_agent_pos(state), push_to_pos, state, push_from_pos, scores, rng)
         else:
-            path, _ = run_astar(get_agent_pos(state), [push_to_pos], state, push_from_pos)
+            path, _ = run_astar(get_agent_pos(state), [push_to_pos], state, push_from_pos, rng=rng)
     else:
-        path, _ = run_astar(get_agent_pos(state), [move[1]], state)
+        path, _ = run_astar(get_agent_pos(state), [move[1]], state, rng=rng)
     
     if path is None:
         return None, None, 1, state_hash
@@ -334,5 +349,5 @@ def attempt_move_wrapper(args):
             move = (path[0][0], path[-1][0], move[2], path[-1][1])
         else:
             move = (path[0][0], path[-1][0])
-        new_state = simulate_move(state.copy(), move)
+        new_state = simulate_move(state.copy(), move, rng)
         return new_state, move, 1, state_hash
\ No newline at end of file
@@ -5,7 +5,9 @@ import itertools
 from models.utils import *
 
 class Agent:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # np.random.Generator or seed used for all the random choices of the agent
+        self.rng = np.random.default_rng(rng)
         self.reset()
     
     def reset(self):
@@ -25,7 +27,7 @@ class Agent:
         goal_pos = get_goal_pos(state, ruleset)
         if len(goal_pos)==0 or avatar_pos is None:
             return False
-        path, actions = run_astar(avatar_pos, goal_pos, state)
+        path, actions = run_astar(avatar_pos, goal_pos, state, rng=self.rng)
         return path is not None
     
     def get_possible_moves(self, grid):
@@ -62,7 +64,7 @@ class Agent:
             elif dist2 < dist1:
                 return moves2
             else:
-                return [moves1, moves2][np.random.choice(2)]
+                return [moves1, moves2][self.rng.integers(2)]
     
     def is_solution(self, state, is_init=False):
         ruleset = extract_ruleset(state)
@@ -71,7 +73,7 @@ class Agent:
         if not is_init:
             if len(goal_pos)==0 or avatar_pos is None:
                 return False, 0
-        path, actions = run_astar(avatar_pos, goal_pos, state)
+        path, actions = run_astar(avatar_pos, goal_pos, state, rng=self.rng)
         return path is not None, 1
             
         
@@ -107,7 +109,7 @@ class Agent:
                 print("NO SOLUTION") if self.debug else None
             else:
                 solution_state_moves = [moves_by_state[hash_grid(sol_state)] for sol_state in solution_states]
-                i = np.random.choice(len(solution_state_moves))#, p=softmax(scores))
+                i = self.rng.integers(len(solution_state_moves))#, p=softmax(scores))
                 joined_moves = [tup for move_list in solution_state_moves[i] for tup in move_list]
                 found_solution = True
         self.search_depth = min([len(moves) for moves in solution_state_moves])
@@ -123,14 +125,14 @@ class Agent:
         for move in moves:
             if len(move)==4:
                 (go_from_pos, go_to_pos, push_from_pos, push_to_pos) = move
-                path, actions = run_astar(go_from_pos, [push_to_pos], sim_state, push_from_pos)
+                path, actions = run_astar(go_from_pos, [push_to_pos], sim_state, push_from_pos, rng=self.rng)
             else:
                 (go_from_pos, go_to_pos) = move
-                path, actions = run_astar(go_from_pos, [go_to_pos], sim_state, push_from_pos)
+                path, actions = run_astar(go_from_pos, [go_to_pos], sim_state, push_from_pos, rng=self.rng)
             if path is None: 
                 return False
             else:
-                sim_state = simulate_move(sim_state, move)
+                sim_state = simulate_move(sim_state, move, self.rng)
         # now can we get to goal
         return self.is_solvable(sim_state)
         
@@ -166,7 +168,7 @@ class Agent:
                 elif dist2 < dist1:
                     return moves2
                 else:
-                    return [moves1, moves2][np.random.choice(2)]
+                    return [moves1, moves2][self.rng.integers(2)]
         
         def attempt_move(state, block_idx, goal_loc):
             """
@@ -179,12 +181,12 @@ class Agent:
             if get_agent_pos(state) is None:
                 return False, state, None, 0
             else:
-                path, actions = run_astar(get_agent_pos(state), [goal_loc], state, block.cur_pos)
+                path, actions = run_astar(get_agent_pos(state), [goal_loc], state, block.cur_pos, rng=self.rng)
                 if path is None:
                     return False, state, None, 1
                 else:
                     block_move = (path[0][0],  path[-1][0], block.cur_pos, goal_loc) #curr pos, resulting pos, push from, push to
-                    sim_state = simulate_move(state.copy(), block_move)
+                    sim_state = simulate_move(state.copy(), block_move, self.rng)
                     return True, sim_state, block_move, 1
         
         moves_by_state = {} 
@@ -207,7 +209,7 @@ class Agent:
                 for (block_idx, goal_loc) in get_possible_actions(state):
                     possible_actions.append((block_idx, goal_loc, state))
             
-            np.random.shuffle(possible_actions)
+            self.rng.shuffle(possible_actions)
             
             for (block_idx, goal_loc, state) in possible_actions:
                 state_hash = hash_grid(state)
@@ -233,7 +235,7 @@ class Agent:
         if len(solution_states)>0:
             solution_state_moves = [moves_by_state[hash_grid(sol_state)] for sol_state in solution_states]
             assert(len(solution_state_moves))==1
-            idx = np.random.choice(len(solution_state_moves))
+            idx = self.rng.integers(len(solution_state_moves))
             return solution_states[idx], solution_state_moves[idx], sum(n_calls.values())
         else:
             return None, None, sum(n_calls.values())
@@ -315,8 +317,8 @@ class Agent:
                         unsolvable_poss_moves.append((poss_move[1], state))
             
             # shuffle next moves
-            np.random.shuffle(maybe_solvable_poss_moves)
-            np.random.shuffle(unsolvable_poss_moves)
+            self.rng.shuffle(maybe_solvable_poss_moves)
+            self.rng.shuffle(unsolvable_poss_moves)
             
             reachable_by_state = {}
             tmp[depth+1]["achv"] = []
@@ -370,13 +372,13 @@ class Agent:
                 # get low level action for high level action
                 if len(self.low_level_actions)==0:
                     grid = env.grid.copy()
-                    path, self.low_level_actions = get_low_level_actions(grid, self.high_level_actions[0])
+                    path, self.low_level_actions = get_low_level_actions(grid, self.high_level_actions[0], self.rng)
                     self.high_level_actions = self.high_level_actions[1:]
                 break
             if self.phase == "solving":
                 #if self.high_level_actions is None:
                 grid = env.grid.copy()
-                path, actions = run_astar(get_agent_pos(grid), get_goal_pos(grid, extract_ruleset(grid)), grid)
+                path, actions = run_astar(get_agent_pos(grid), get_goal_pos(grid, extract_ruleset(grid)), grid, rng=self.rng)
                 if path is None:
                     self.phase = "centering"
                     # reset env
@@ -403,10 +405,7 @@ class Agent:
         rule_to_change = rule[1]
 
         # get objs currently in grid
-        objs_in_grid = set()
-        for e in grid:
-            if e is not None:
-                objs_in_grid.add(e.type)
+        objs_in_grid = grid.object_types(top=True)
 
         # replace objs if we are forming a replace rule
         if to_form and rule_to_change[0].type=="rule_object" and rule_to_change[0].name in objs_in_grid and rule_to_change[2].type=="rule_object":
@@ -439,7 +438,7 @@ class Agent:
         
         for r in rule:   
             if r.id not in reachable[state_hash].keys():
-                reachable[state_hash][r.id] = is_reachable(grid, r) 
+                reachable[state_hash][r.id] = is_reachable(grid, r, self.rng) 
                 n_calls += 1
             
         pos0 = rule[0].cur_pos
@@ -518,9 +517,9 @@ class Agent:
                     if not same_pos(curr_block_loc, block_loc):
                         agent_pos = get_agent_pos(sim_state)
                         if isinstance(agent_pos, list):
-                            agent_pos = agent_pos[np.random.choice(len(agent_pos))]
+                            agent_pos = agent_pos[self.rng.integers(len(agent_pos))]
                         move = (agent_pos,  None, curr_block_loc, block_loc)
-                        sim_state = simulate_move(sim_state.copy(), move)
+                        sim_state = simulate_move(sim_state.copy(), move, self.rng)
             score = score_grid(sim_state)
             scores.append(score)
         
@@ -1,31 +1,29 @@
-import pygame
 from models.flat_agent import FlatAgent
 from models.mepomdp_agent import Agent
-from gym.utils.play import display_arr
-from pygame import VIDEORESIZE
-import pandas as pd
 import numpy as np
 from game.baba.registration import make
 import warnings
 import time
-from game.baba.my_envs import * 
-from game.baba.registration import register
 
 
-def make_agent(model_tp):
+def make_agent(model_tp, rng=None):
     if model_tp=="flat":
-        agent = FlatAgent()
+        agent = FlatAgent(rng)
     elif model_tp == "mepomdp":
-        agent = Agent()
+        agent = Agent(rng)
     elif model_tp == "mepomdp_rr":
-        agent = Agent(rr=True)
+        raise ValueError("mepomdp_rr is no longer supported")
     else:
         print("no agent type ", model_tp)
         assert False
     return agent
 
 
-def model_play(env, model_tp="mepomdp", transpose=True, fps=30, zoom=None, callback=None, keys_to_action=None):
+def model_play(env, model_tp="mepomdp", transpose=True, fps=30, zoom=None, callback=None, keys_to_action=None, rng=None):
+    import pygame
+    from pygame import VIDEORESIZE
+    from gym.utils.play import display_arr
+
     if keys_to_action is None:
         keys_to_action = {
             1: env.actions.up,
@@ -58,7 +56,7 @@ def model_play(env, model_tp="mepomdp", transpose=True, fps=30, zoom=None, callb
     pygame.display.flip()
     clock.tick(fps)
         
-    agent = make_agent(model_tp)
+    agent = make_agent(model_tp, rng)
     
     while running:
         step_info = agent.get_action(env)
@@ -106,17 +104,19 @@ def run_single():
     n_runs_per_env = 1
     for model_tp in ["flat"]:#, "flat"]:
         for run in range(n_runs_per_env):
-            for env_tp in [Env7D0]:
-                np.random.seed(run)
-                print(env_tp.__name__)
+            for env_name in ["Env7D0"]:
+                rng = np.random.default_rng(run)
+                print(env_name)
                 print("---------")
-                env = make("env/"+ env_tp.__name__)
+                env = make("env/" + env_name)
                 #start=time.time()
-                data, summ_data = model_play(env, model_tp, 1)
+                data, summ_data = model_play(env, model_tp, 1, rng=rng)
                 print(summ_data)
                 #print(time.time()-start)
 
 def run_experiment():
+    import pandas as pd
+
     out_dir = "models/output/"
     
     model_n_seeds = {"mepomdp": 50, "flat": 1}
@@ -130,18 +130,19 @@ def run_experiment():
         for seed in range(n_seeds):
             print(seed)
             print("\n\n")
-            for env_tp in [Env1D0, Env1D1, Env2D0, Env2D1, Env3D0, Env3D1, Env4D0, Env4D1, Env5D0, Env5D1, Env6D0, Env6D1, Env7D0, Env7D1, Env8D0, Env8D1, Env9D0, Env9D1, Env10D0, Env10D1, Env11D0, Env11D1, Env12D0, Env12D1, Env13D0, Env13D1, Env14D0, Env14D1, Env15D0, Env15D1]:
-                np.random.seed(seed)
-                print(env_tp.__name__)
+            for env_name in [f"Env{i}D{d}" for i in range(1, 16) for d in range(2)]:
+                # each run has its own random stream, so the runs don't depend on each other
+                rng = np.random.default_rng(seed)
+                print(env_name)
                 print("---------")
                 start=time.time()
-                env = make("env/"+ env_tp.__name__)
-                data, summ_data = model_play(env, model_tp, 1)
+                env = make("env/" + env_name)
+                data, summ_data = model_play(env, model_tp, 1, rng=rng)
                 df = pd.DataFrame.from_records(data)
                 summ_df = pd.DataFrame.from_records([summ_data])
-                df["env_name"] = env_tp.__name__
+                df["env_name"] = env_name
                 df["seed"] = seed
-                summ_df["env_name"] = env_tp.__name__
+                summ_df["env_name"] = env_name
                 summ_df["seed"] = seed
                 all_data.append(df)
                 all_summ_data.append(summ_df)
@@ -151,13 +152,7 @@ def run_experiment():
                 final_summ_df.to_csv(out_dir + model_tp + "_summ.csv", index=False)
                 print(time.time()-start)
                 
-def register_envs():
-    for env in [Tutorial1, Tutorial2, Tutorial3, Tutorial4, Tutorial5, Tutorial6, Tutorial7, Tutorial8, Tutorial9, Env1D0, Env1D1, Env2D0, Env2D1, Env3D0, Env3D1, Env4D0, Env4D1, Env5D0, Env5D1, Env6D0, Env6D1, Env7D0, Env7D1, Env8D0, Env8D1, Env9D0, Env9D1, Env10D0, Env10D1, Env11D0, Env11D1, Env12D0, Env12D1, Env13D0, Env13D1, Env14D0, Env14D1, Env15D0, Env15D1]:
-        register('env/' +  env.__name__, env)
-
 if __name__ == "__main__":
     
-    register_envs()
-    
     run_single()
     #run_experiment()
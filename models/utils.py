@@ -3,23 +3,24 @@ import heapq
 import os
 import glob
 from game.baba.rule import extract_ruleset
-from PIL import Image, ImageDraw, ImageFont
+from game.baba.world_object import Ruleset
 import itertools
 
 """
 Common util functions between mepomdp and flat agents
+The random choices use the np.random.Generator `rng` given to the functions (a new one if None)
 """
 
-def get_low_level_actions(grid, high_level_action):
+def get_low_level_actions(grid, high_level_action, rng=None):
     """
     Executes actions of the form "move to this loc" or "push block to this loc"
     """
     if len(high_level_action)==4 :
         (go_from_pos, go_to_pos, push_from_pos, push_to_pos) = high_level_action
-        path, actions = run_astar(go_from_pos, [push_to_pos], grid, push_from_pos) 
+        path, actions = run_astar(go_from_pos, [push_to_pos], grid, push_from_pos, rng=rng) 
     elif len(high_level_action)==2:
         goal_pos = [high_level_action[1]]
-        path, actions = run_astar(high_level_action[0], goal_pos, grid)
+        path, actions = run_astar(high_level_action[0], goal_pos, grid, rng=rng)
     else:
         raise ValueError(f"Unknown action type")
     return path, actions
@@ -42,7 +43,7 @@ def estimate_moves_dist(moves):
     return sum([move_dist(m) for m in moves])
 
 
-def simulate_move(grid, move):
+def simulate_move(grid, move, rng=None):
     """
     Quickly simulate resulting grid state after taking given move, without doing low-level pathfinding
     """
@@ -75,7 +76,7 @@ def simulate_move(grid, move):
                 vec = np.array([push_to_pos[0] - push_from_pos[0], push_to_pos[1] - push_from_pos[1]])
             # handle ties
             if abs(vec[0])==abs(vec[1]):
-                vec[np.random.choice(2)] = 0
+                vec[np.random.default_rng(rng).integers(2)] = 0
             vec *= abs(vec)==max(abs(vec))
             dir = [int(e) for e in vec/sum(vec)]
                 
@@ -133,7 +134,7 @@ def get_rules_for_astar(grid, agent_el, block_el, agent_pos, block_pos):
     return (avatar_exists, list(rule_dict["stop"]), list(rule_dict["sink"]), is_float)
     
     
-def run_astar(agent_pos, goal_pos, grid, block_pos=None, goal_pos_scores=None):
+def run_astar(agent_pos, goal_pos, grid, block_pos=None, goal_pos_scores=None, rng=None):
     """
         A* pathfinder
         If block_pos is provided, find a path to push the block to goal_pos
@@ -142,20 +143,21 @@ def run_astar(agent_pos, goal_pos, grid, block_pos=None, goal_pos_scores=None):
     
     # Deal with special case of multiple agents
     if isinstance(agent_pos, list):
-        paths_and_actions = [run_astar(p, goal_pos, grid, block_pos, goal_pos_scores) for p in agent_pos]
+        rng = np.random.default_rng(rng)
+        paths_and_actions = [run_astar(p, goal_pos, grid, block_pos, goal_pos_scores, rng) for p in agent_pos]
         valid_paths_and_actions = [tup for tup in paths_and_actions if tup[0] is not None]
         if len(valid_paths_and_actions)==0:
             return None, []
         else:
             scores = [1/(len(actions)+1) for (path, actions) in valid_paths_and_actions]
-            path, actions = valid_paths_and_actions[np.random.choice(len(valid_paths_and_actions), p=softmax(scores))]
+            path, actions = valid_paths_and_actions[rng.choice(len(valid_paths_and_actions), p=softmax(scores))]
             return path, actions
     # Deal with special case of preferred goal positions
     if goal_pos_scores is not None:
         while(len(goal_pos)>0):
             max_score = max(goal_pos_scores)
             best_positions = [p for (i,p) in enumerate(goal_pos) if goal_pos_scores[i]==max_score]
-            path, actions = run_astar(agent_pos, best_positions, grid, block_pos) 
+            path, actions = run_astar(agent_pos, best_positions, grid, block_pos, rng=rng) 
             if path is not None:
                 return path, actions
             goal_pos = [p for (i,p) in enumerate(goal_pos) if goal_pos_scores[i]!=max_score]
@@ -308,7 +310,7 @@ def n_adjacent_rule_block(grid, pos, exclude_ids=[]):
     return n  
  
 def update_rules(grid):
-    ruleset = extract_ruleset(grid)
+    ruleset = Ruleset(extract_ruleset(grid))
     for (obj1, obj2) in ruleset.get('replace', []):
         grid.replace(obj1, obj2)
     for e_list in grid.grid:
@@ -326,10 +328,7 @@ def get_agent_pos(grid, ruleset=None):
     if ruleset.get('is_agent') is not None:
         agent_tps = list(ruleset['is_agent'].keys())
     if len(agent_tps)>0:
-        for (k,e) in enumerate(grid):
-            if e!=None:
-                if e.type in agent_tps:
-                    avatar_pos.append(e.cur_pos)
+        avatar_pos = grid.positions(agent_tps, top=True)
 
     if len(avatar_pos)==0:
         return None
@@ -371,34 +370,33 @@ def get_goal_pos(grid, ruleset):
     if ruleset.get('is_goal') is not None:
         goal_tps = list(ruleset['is_goal'].keys())
     if len(goal_tps)>0:
-        for (k,e) in enumerate(grid):
-            if e!=None:
-                if e.type in goal_tps:
-                    goal_pos.append(e.cur_pos)
-                else:
-                    e_under = grid.get_under(*e.cur_pos) 
-                    if e_under is not None and e_under.type in goal_tps:
-                        goal_pos.append(e.cur_pos)
+        for pos in grid.positions(goal_tps):
+            e = grid.get(*pos)
+            e_under = grid.get_under(*pos)
+            if e.type in goal_tps or (e_under is not None and e_under.type in goal_tps):
+                goal_pos.append(pos)
     return goal_pos
 
 def get_block_by_id(grid, block_id):
-    for k, e in enumerate(grid):
+    pos = grid.block_pos(block_id)
+    if pos is not None:
+        e = grid.get(*pos)
         if e is not None and "rule" in e.type and e.id==block_id:
             return e
     return None
 
-def is_reachable(grid, block):
-    path, actions = run_astar(get_agent_pos(grid), [block.cur_pos], grid)
+def is_reachable(grid, block, rng=None):
+    path, actions = run_astar(get_agent_pos(grid), [block.cur_pos], grid, rng=rng)
     return path is not None
 
-def get_reachable_rule_blocks(grid):
+def get_reachable_rule_blocks(grid, rng=None):
     rule_blocks = [e for e in grid if  e is not None and "rule" in e.type] 
     reachable_rule_blocks = []
     n_calls = 0
     ruleset = extract_ruleset(grid)
     for (i, rule_block) in enumerate(rule_blocks):
         n_calls +=1
-        path, actions = run_astar(get_agent_pos(grid, ruleset), [rule_block.cur_pos], grid)
+        path, actions = run_astar(get_agent_pos(grid, ruleset), [rule_block.cur_pos], grid, rng=rng)
         if path is not None:
             reachable_rule_blocks.append(rule_block)
     return reachable_rule_blocks, n_calls
@@ -422,7 +420,7 @@ def cell_in_type(pos, types, grid):
 def add_rule_block_ids(grid):
     rule_blocks = [e for e in grid if e is not None and "rule" in e.type] 
     for (i, rule_block) in enumerate(rule_blocks):
-        rule_block.id = i
+        grid.set_id(rule_block, i)
 
 def softmax(x):
     x = np.array(x)
@@ -433,7 +431,7 @@ def is_border(grid, pos):
     return not(grid.get(*pos) is None) and grid.get(*pos).type=="border"
 
 def hash_grid(state):
-    return hash(state.encode().tobytes())
+    return state.hash()
 
 def rules_eq(rule1, rule2):
     return np.all([rule1[i].id == rule2[i].id for i in range(3)])
@@ -460,6 +458,8 @@ def on_y_border(block, grid):
     return (block.cur_pos[1] in [1, grid.height-2])
 
 def vis_grid(grid, path, ann=""):
+    from PIL import Image, ImageDraw, ImageFont
+
     os.makedirs(path, exist_ok=True)
     existing_files = glob.glob(os.path.join(path, "*.png"))
     next_number = len(existing_files) + 1